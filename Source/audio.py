@@ -0,0 +1,134 @@
+import os
+import threading
+import time
+
+SOUND_FILES = {
+    "click": "resource/click.wav",
+    "correct": "resource/correct.wav",
+    "wrong": "resource/wrong.wav",
+    "typing": "resource/keytype.wav",
+    "backspace": "resource/backspace.wav",
+    "space": "resource/spacebar.wav"
+}
+KEY_SOUNDS = {
+    'BackSpace': "backspace",
+    'space': "space"
+}
+MIXER_CHANNELS = 16
+KEY_CHANNELS = 4
+KEY_MIN_INTERVAL = 0.025
+KEY_REPEAT_INTERVAL = 0.09
+
+
+def audio_disabled():
+    """Audio is off when G5MT_NO_AUDIO is set, e.g. on headless CI machines"""
+    return os.environ.get("G5MT_NO_AUDIO", "").lower() not in ("", "0", "false")
+
+
+class AudioManager:
+    """Loads pygame and the sound effects off the UI thread
+
+    Until loading finishes, or if there is no usable audio device, play()
+    does nothing, so the UI never waits for the mixer.
+    """
+
+    def __init__(self, sound_files=SOUND_FILES):
+        self.sound_files = sound_files
+        self.sounds = {}
+        self.key_channels = []
+        self.ready = threading.Event()
+        self.available = False
+        self._thread = None
+
+    def start(self):
+        """Begin loading in the background; safe to call more than once"""
+        if self._thread is None and not audio_disabled():
+            self._thread = threading.Thread(target=self._load, name="audio-loader", daemon=True)
+            self._thread.start()
+
+    def _load(self):
+        try:
+            import pygame
+            pygame.mixer.init()
+            sounds = {name: pygame.mixer.Sound(path) for name, path in self.sound_files.items()}
+            # Keystrokes get their own channels so fast typing never steals the
+            # channels used by clicks and answer sounds, or vice versa
+            pygame.mixer.set_num_channels(MIXER_CHANNELS)
+            pygame.mixer.set_reserved(KEY_CHANNELS)
+            key_channels = [pygame.mixer.Channel(i) for i in range(KEY_CHANNELS)]
+        except Exception as e:
+            print(f"Audio unavailable, continuing without sound: {e}")
+            return
+        self.sounds = sounds
+        self.key_channels = key_channels
+        self.available = True
+        self.ready.set()
+
+    def wait(self, timeout=None):
+        """Block until the sounds are loaded; returns whether audio is available"""
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return self.available
+
+    def play(self, name, volume):
+        if not self.available:
+            return
+        sound = self.sounds[name]
+        sound.set_volume(volume)
+        sound.play()
+
+
+class KeySoundEngine:
+    """Plays keystroke sounds on the reserved channel pool
+
+    The volume is recomputed only when the volume settings change, and is
+    applied to the pool channels rather than set on every key. Keys pressed
+    closer together than KEY_MIN_INTERVAL, and auto-repeats of a held key
+    faster than KEY_REPEAT_INTERVAL, are coalesced into the sound already
+    playing.
+    """
+
+    def __init__(self, audio, master_volume, typing_volume):
+        self.audio = audio
+        self.master_volume = master_volume
+        self.typing_volume = typing_volume
+        self.volume = 1.0
+        self.applied_volume = None
+        self.next_channel = 0
+        self.last_keysym = None
+        self.last_time = 0.0
+        self.update_volume()
+        master_volume.trace_add('write', self.update_volume)
+        typing_volume.trace_add('write', self.update_volume)
+
+    def update_volume(self, *args):
+        self.volume = self.typing_volume.get() * self.master_volume.get()
+
+    def sound_for(self, event):
+        if event.keysym in KEY_SOUNDS:
+            return KEY_SOUNDS[event.keysym]
+        if event.char.isalnum():
+            return "typing"
+        return None
+
+    def on_key(self, event):
+        audio = self.audio
+        if not audio.available:
+            return
+        name = self.sound_for(event)
+        if name is None:
+            return
+        now = time.perf_counter()
+        elapsed = now - self.last_time
+        if elapsed < KEY_MIN_INTERVAL or (event.keysym == self.last_keysym and elapsed < KEY_REPEAT_INTERVAL):
+            return
+        self.last_keysym = event.keysym
+        self.last_time = now
+        channels = audio.key_channels
+        if self.applied_volume != self.volume:
+            for channel in channels:
+                channel.set_volume(self.volume)
+            self.applied_volume = self.volume
+        channel = channels[self.next_channel]
+        self.next_channel = (self.next_channel + 1) % len(channels)
+        channel.play(audio.sounds[name])
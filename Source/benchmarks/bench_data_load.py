@@ -0,0 +1,61 @@
+"""Measure term data load time and memory: separate JSON files vs the compiled bundle
+
+Run from the Source directory:
+    python benchmarks/bench_data_load.py [--repeat 50]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from resource_bundle import TERM_FILES, load_bundle
+
+
+def load_separate_files():
+    """The original loader: parse every JSON file on its own"""
+    data = {}
+    for key, file_name in TERM_FILES.items():
+        with open(file_name, 'r', encoding='utf-8') as file:
+            data[key] = json.load(file)
+    return data
+
+
+def measure(label, loader, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        loader()
+    elapsed_ms = (time.perf_counter() - start) / repeat * 1000
+    tracemalloc.start()
+    data = loader()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<22} {elapsed_ms:8.3f} ms/load | retained {retained / 1024:8.1f} KiB | "
+          f"peak {peak / 1024:8.1f} KiB")
+    return data
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as directory:
+        bundle_path = os.path.join(directory, "terms.bundle.json")
+
+        def cold():
+            if os.path.exists(bundle_path):
+                os.remove(bundle_path)
+            return load_bundle(bundle_path=bundle_path)
+
+        expected = measure("separate JSON files", load_separate_files, args.repeat)
+        measure("bundle (cold compile)", cold, args.repeat)
+        loaded = measure("bundle (cached)", lambda: load_bundle(bundle_path=bundle_path), args.repeat)
+        assert loaded == expected
+
+
+if __name__ == "__main__":
+    main()
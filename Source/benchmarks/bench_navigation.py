@@ -0,0 +1,64 @@
+"""Measure screen switch latency with cached screens vs rebuilding them each time
+
+Needs a display (use xvfb-run on headless machines). Run from the Source directory:
+    python benchmarks/bench_navigation.py [--rounds 50] [--rebuild]
+
+--rebuild discards every hidden screen before each switch, which reproduces
+the old destroy-and-rebuild navigation.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("G5MT_NO_AUDIO", "1")
+
+import tkinter as tk
+from main import App
+
+
+def count_widgets(widget):
+    return 1 + sum(count_widgets(child) for child in widget.winfo_children())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=50)
+    parser.add_argument("--rebuild", action="store_true")
+    args = parser.parse_args()
+    root = tk.Tk()
+    app = App(root)
+    app.inline_feedback.set(True)
+    app.auto_advance.set(0)
+    steps = [
+        ("start test", app.start_test_menu),
+        ("test by parts", app.test_by_parts_menu),
+        ("run test", lambda: app.run_test("tempo", "Tempo")),
+        ("next question", app.next_question),
+        ("main menu", app.create_main_menu),
+        ("dictionary", lambda: app.show_dictionary("dictionary")),
+        ("history", app.view_test_history),
+        ("settings", app.show_settings_menu),
+        ("main menu", app.create_main_menu),
+    ]
+    timings = {name: [] for name, _ in steps}
+    root.update()
+    for _ in range(args.rounds):
+        for name, step in steps:
+            if args.rebuild:
+                app.screens.discard_hidden()
+            start = time.perf_counter()
+            step()
+            root.update_idletasks()
+            timings[name].append((time.perf_counter() - start) * 1000)
+    mode = "rebuild" if args.rebuild else "cached"
+    print(f"{mode} navigation over {args.rounds} rounds, {count_widgets(root)} live widgets at the end")
+    for name, samples in timings.items():
+        print(f"  {name:<14} median {statistics.median(samples):7.2f} ms  max {max(samples):7.2f} ms")
+    root.destroy()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Compare per-keystroke dictionary search latency: original full scan vs SearchIndex
+
+Run from the Source directory:
+    python benchmarks/bench_search.py [--sizes 135 10000 50000]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from search_index import SearchIndex, linear_search
+
+
+def build_dictionary(size, seed=0):
+    """Grow the bundled dictionary to size entries with suffixed copies"""
+    with open("resource/dictionary.json", 'r', encoding='utf-8') as file:
+        base = list(json.load(file).items())
+    rng = random.Random(seed)
+    dictionary = {}
+    while len(dictionary) < size:
+        key, value = rng.choice(base)
+        suffix = len(dictionary)
+        dictionary[f"{key} {suffix}"] = f"{value} ({suffix})"
+    return dictionary
+
+
+def type_queries(words):
+    """Return the successive queries produced by typing, then clearing, each word"""
+    queries = []
+    for word in words:
+        queries.extend(word[:i] for i in range(1, len(word) + 1))
+        queries.append("")
+    return queries
+
+
+def time_per_query(search, queries):
+    start = time.perf_counter()
+    for query in queries:
+        search(query)
+    return (time.perf_counter() - start) / len(queries) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[135, 10000, 50000])
+    args = parser.parse_args()
+    queries = type_queries(["allegro", "speed", "quick", "pedal", "sorrowful"])
+    for size in args.sizes:
+        dictionary = build_dictionary(size)
+        start = time.perf_counter()
+        index = SearchIndex(dictionary)
+        build_ms = (time.perf_counter() - start) * 1000
+        scan_ms = time_per_query(lambda q: linear_search(dictionary, q), queries)
+        # The view only formats rows that changed, so the lookup alone is the per-key cost
+        index_ms = time_per_query(index.search, queries)
+        print(f"{size:>7} terms: build {build_ms:8.1f} ms | scan {scan_ms:8.3f} ms/key | "
+              f"index {index_ms:8.3f} ms/key | {scan_ms / index_ms:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
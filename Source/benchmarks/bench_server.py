@@ -0,0 +1,88 @@
+"""Load-test the classroom server with many concurrent simulated students
+
+Starts a QuizServer in-process on a free port, with history in a temporary
+file, then runs one keep-alive connection per student taking a full test.
+Run from the Source directory:
+    python benchmarks/bench_server.py [--students 300] [--category dictionary]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from resource_bundle import load_bundle
+from server import QuizServer
+
+
+async def call(reader, writer, method, path, payload=None):
+    body = json.dumps(payload).encode('utf-8') if payload is not None else b""
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: bench\r\nContent-Length: {len(body)}\r\n\r\n".encode('latin-1') + body)
+    await writer.drain()
+    await reader.readline()
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line == b"\r\n":
+            break
+        name, _, value = line.decode('latin-1').partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    return json.loads(await reader.readexactly(length))
+
+
+async def student(port, category, answers, latencies, rng):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    start = time.perf_counter()
+    data = await call(reader, writer, "POST", "/sessions", {'category': category})
+    latencies.append(time.perf_counter() - start)
+    session_id = data['session']
+    question = data['question']
+    while question is not None:
+        answer = answers[question['term']] if rng.random() < 0.7 else "no idea"
+        start = time.perf_counter()
+        data = await call(reader, writer, "POST", f"/sessions/{session_id}/answer", {'answer': answer})
+        latencies.append(time.perf_counter() - start)
+        question = data['question']
+    writer.close()
+    return data['record']
+
+
+async def run(students, category):
+    data = load_bundle()
+    with tempfile.TemporaryDirectory() as directory:
+        server = QuizServer(data, history_path=os.path.join(directory, "history.db"))
+        listener = await server.start("127.0.0.1", 0)
+        port = listener.sockets[0].getsockname()[1]
+        latencies = []
+        rng = random.Random(0)
+        start = time.perf_counter()
+        records = await asyncio.gather(*(student(port, category, data[category], latencies, rng)
+                                         for _ in range(students)))
+        elapsed = time.perf_counter() - start
+        await server.close()
+        stored = len(server.store)
+    latencies.sort()
+    print(f"{students} concurrent students, {len(latencies)} requests in {elapsed:.2f} s "
+          f"({len(latencies) / elapsed:.0f} req/s)")
+    print(f"latency p50 {statistics.median(latencies) * 1000:.2f} ms, "
+          f"p99 {latencies[int(len(latencies) * 0.99)] * 1000:.2f} ms")
+    print(f"{len(records)} tests finished, {stored} history records written")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--students", type=int, default=300)
+    parser.add_argument("--category", default="dictionary")
+    args = parser.parse_args()
+    asyncio.run(run(args.students, args.category))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Measure time from process start to the first painted frame of the app
+
+Needs a display (use xvfb-run on headless machines). Run from the Source directory:
+    python benchmarks/bench_startup.py [--runs 10] [--eager-audio]
+
+--eager-audio loads pygame and the sounds before the first frame, as the app
+used to, for comparison with the default background loading.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+SOURCE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def child(eager_audio):
+    start = time.perf_counter()
+    sys.path.insert(0, SOURCE_DIR)
+    import tkinter as tk
+    from main import App
+    root = tk.Tk()
+    app = App(root)
+    if eager_audio:
+        app.audio.start()
+        app.audio.wait()
+    root.update()
+    print(f"first_frame_ms={(time.perf_counter() - start) * 1000:.3f}")
+    root.destroy()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--eager-audio", action="store_true")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(args.eager_audio)
+        return
+    command = [sys.executable, os.path.abspath(__file__), "--child"]
+    if args.eager_audio:
+        command.append("--eager-audio")
+    samples = []
+    for _ in range(args.runs):
+        output = subprocess.run(command, cwd=SOURCE_DIR, capture_output=True, text=True, check=True).stdout
+        line = next(line for line in output.splitlines() if line.startswith("first_frame_ms="))
+        samples.append(float(line.split("=", 1)[1]))
+    print(f"time to first frame over {args.runs} runs: median {statistics.median(samples):.1f} ms, "
+          f"min {min(samples):.1f} ms, max {max(samples):.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,305 @@
+"""Headless benchmark suite for the app's hot paths, with JSON results
+
+Starts Xvfb when there is no DISPLAY and runs pygame with the dummy SDL audio
+driver. The app runs in a scratch copy of resource/, so your settings and
+history are never touched. Run from the Source directory:
+    python benchmarks/bench_suite.py [--output results.json] [--compare baseline.json] [--quick]
+
+Measures cold startup to first frame, next_question transitions,
+update_search per keystroke at 200/10k/100k terms, view_test_history at
+10/1k/100k records and save_test_history. Every timing is reported in ms
+as n, median, p90, max and mean.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SOURCE_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, SOURCE_DIR)
+
+SEARCH_SIZES = [200, 10000, 100000]
+HISTORY_SIZES = [10, 1000, 100000]
+SEARCH_WORDS = ["allegro", "speed", "quick", "pedal", "sorrowful"]
+XVFB_SCREEN = "1024x768x24"
+
+
+def summarize(samples):
+    samples = sorted(samples)
+    return {
+        'n': len(samples),
+        'median_ms': round(statistics.median(samples), 3),
+        'p90_ms': round(samples[min(len(samples) - 1, int(len(samples) * 0.9))], 3),
+        'max_ms': round(samples[-1], 3),
+        'mean_ms': round(statistics.fmean(samples), 3)
+    }
+
+
+def start_virtual_display():
+    """Start Xvfb on a free display number unless a display is already set; returns the process"""
+    if os.environ.get("DISPLAY"):
+        return None
+    xvfb = shutil.which("Xvfb")
+    if xvfb is None:
+        sys.exit("No DISPLAY and Xvfb is not installed (e.g. apt install xvfb)")
+    number = next(n for n in range(99, 200) if not os.path.exists(f"/tmp/.X{n}-lock"))
+    process = subprocess.Popen([xvfb, f":{number}", "-screen", "0", XVFB_SCREEN, "-nolisten", "tcp"],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 10
+    while not os.path.exists(f"/tmp/.X11-unix/X{number}"):
+        if process.poll() is not None or time.monotonic() > deadline:
+            process.kill()
+            sys.exit("Xvfb did not start")
+        time.sleep(0.05)
+    os.environ["DISPLAY"] = f":{number}"
+    return process
+
+
+def make_workspace():
+    """Copy the resources, minus any user state, into a scratch directory and work there"""
+    workspace = tempfile.mkdtemp(prefix="g5mt-bench-")
+    shutil.copytree(os.path.join(SOURCE_DIR, "resource"), os.path.join(workspace, "resource"),
+                    ignore=shutil.ignore_patterns("history.db*", "app_config.json.*", "profile.jsonl",
+                                                  "packs", "*.tmp"))
+    os.chdir(workspace)
+    return workspace
+
+
+def pump(root, app=None):
+    """Process pending events, including every chunk of a dictionary redraw"""
+    root.update()
+    while app is not None and app.render_steps is not None:
+        root.update()
+
+
+def child_startup():
+    start = time.perf_counter()
+    import tkinter as tk
+    from main import App
+    root = tk.Tk()
+    app = App(root)
+    root.update()
+    print(f"first_frame_ms={(time.perf_counter() - start) * 1000:.3f}")
+    app.on_close()
+
+
+def bench_startup(runs):
+    command = [sys.executable, os.path.abspath(__file__), "--child-startup"]
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run(command, capture_output=True, text=True, check=True).stdout
+        line = next(line for line in output.splitlines() if line.startswith("first_frame_ms="))
+        samples.append(float(line.split("=", 1)[1]))
+    return summarize(samples)
+
+
+def bench_next_question(app, root, rounds):
+    app.inline_feedback.set(True)
+    app.auto_advance.set(0)
+    samples = []
+    app.run_test("dictionary", "Complete Test")
+    pump(root)
+    for _ in range(rounds):
+        if app.session.finished:
+            # Restarted untimed, so no result is written to history
+            app.run_test("dictionary", "Complete Test")
+            pump(root)
+        start = time.perf_counter()
+        app.next_question()
+        root.update_idletasks()
+        samples.append((time.perf_counter() - start) * 1000)
+    app.exit_test()
+    return summarize(samples)
+
+
+def bench_update_search(app, root, sizes):
+    from bench_search import build_dictionary, type_queries
+    from search_index import SearchIndex
+
+    results = {}
+    queries = type_queries(SEARCH_WORDS)
+    for size in sizes:
+        key = f"bench_{size}"
+        app.search_indexes[key] = SearchIndex(build_dictionary(size))
+        app.show_dictionary(key)
+        pump(root, app)
+        first_chunk = []
+        complete = []
+        for query in queries:
+            app.search_entry.delete(0, 'end')
+            app.search_entry.insert(0, query)
+            start = time.perf_counter()
+            # Called directly, as the debounce timer would, so the delay is not measured
+            app.update_search()
+            root.update_idletasks()
+            first_chunk.append((time.perf_counter() - start) * 1000)
+            pump(root, app)
+            complete.append((time.perf_counter() - start) * 1000)
+        results[str(size)] = {'first_chunk': summarize(first_chunk), 'complete': summarize(complete)}
+        app.create_main_menu()
+        del app.search_indexes[key]
+    return results
+
+
+def history_records(count):
+    start = datetime(2020, 1, 1, 9, 0)
+    types = ["Complete Test", "Tempo", "Dynamics", "Signs"]
+    records = []
+    for i in range(count):
+        correct = (i * 7) % 36
+        records.append({
+            'date': (start + timedelta(hours=3 * i)).strftime("%Y-%m-%d %H:%M"),
+            'test_type': types[i % len(types)],
+            'score': f"{correct}/35",
+            'percentage': f"{correct / 35 * 100:.1f}%"
+        })
+    return records
+
+
+def bench_history(app, root, sizes, rounds):
+    from history_store import HistoryStore
+
+    results = {}
+    for size in sizes:
+        app.create_main_menu()
+        # Dropping the cached screen makes the next visit build it over the new store
+        app.screens.discard_hidden()
+        app.test_history.close()
+        path = os.path.abspath(f"resource/bench_history_{size}.db")
+        store = HistoryStore(path)
+        store.extend(history_records(size))
+        app.test_history = store
+        start = time.perf_counter()
+        app.view_test_history()
+        root.update_idletasks()
+        cold = (time.perf_counter() - start) * 1000
+        warm = []
+        for _ in range(rounds):
+            app.create_main_menu()
+            root.update_idletasks()
+            start = time.perf_counter()
+            app.view_test_history()
+            root.update_idletasks()
+            warm.append((time.perf_counter() - start) * 1000)
+        results[str(size)] = {'cold_ms': round(cold, 3), 'warm': summarize(warm)}
+    app.create_main_menu()
+    return results
+
+
+def bench_save(app, rounds):
+    calls = []
+    durable = []
+    for i in range(rounds):
+        app.auto_advance.set(i % 2)
+        start = time.perf_counter()
+        app.save_test_history()
+        calls.append((time.perf_counter() - start) * 1000)
+        app.config_store.flush()
+        durable.append((time.perf_counter() - start) * 1000)
+    return {'call': summarize(calls), 'until_on_disk': summarize(durable)}
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=SOURCE_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def flatten(results, prefix=""):
+    """Yield (metric path, value) for every median and single-value timing"""
+    for key, value in results.items():
+        path = f"{prefix}{key}"
+        if isinstance(value, dict):
+            if 'median_ms' in value:
+                yield path, value['median_ms']
+            else:
+                yield from flatten(value, path + ".")
+        elif key.endswith("_ms"):
+            yield path, value
+
+
+def compare(baseline, current):
+    old = dict(flatten(baseline['results']))
+    for path, value in flatten(current['results']):
+        if path in old and old[path]:
+            change = (value - old[path]) / old[path] * 100
+            print(f"{path:<48} {old[path]:10.3f} -> {value:10.3f} ms  {change:+7.1f}%")
+
+
+def run(args):
+    import tkinter as tk
+    from main import App
+
+    results = {'startup_first_frame': bench_startup(args.startup_runs)}
+    root = tk.Tk()
+    app = App(root)
+    pump(root)
+    results['next_question'] = bench_next_question(app, root, args.rounds)
+    results['update_search'] = bench_update_search(app, root, args.search_sizes)
+    results['view_test_history'] = bench_history(app, root, args.history_sizes, args.rounds)
+    results['save_test_history'] = bench_save(app, args.rounds)
+    app.on_close()
+    return {
+        'revision': git_revision(),
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'tk': tk.TkVersion,
+        'platform': platform.platform(),
+        'results': results
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", help="also write the JSON results to this file")
+    parser.add_argument("--compare", metavar="BASELINE", help="print the change from an earlier results file")
+    parser.add_argument("--rounds", type=int, default=50)
+    parser.add_argument("--startup-runs", type=int, default=5)
+    parser.add_argument("--quick", action="store_true", help="smaller sizes for a fast smoke run")
+    parser.add_argument("--child-startup", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child_startup:
+        child_startup()
+        return
+    args.search_sizes = SEARCH_SIZES[:2] if args.quick else SEARCH_SIZES
+    args.history_sizes = HISTORY_SIZES[:2] if args.quick else HISTORY_SIZES
+    output = os.path.abspath(args.output) if args.output else None
+    baseline = None
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as file:
+            baseline = json.load(file)
+
+    os.environ["SDL_AUDIODRIVER"] = "dummy"
+    # pygame's import banner would otherwise land in front of the JSON on stdout
+    os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
+    display = start_virtual_display()
+    source_cwd = os.getcwd()
+    workspace = make_workspace()
+    try:
+        report = run(args)
+    finally:
+        os.chdir(source_cwd)
+        shutil.rmtree(workspace, ignore_errors=True)
+        if display is not None:
+            display.terminate()
+    text = json.dumps(report, indent=2)
+    print(text)
+    if output:
+        with open(output, 'w', encoding='utf-8') as file:
+            file.write(text + "\n")
+    if baseline is not None:
+        compare(baseline, report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+import json
+import os
+import threading
+
+CONFIG_BACKUPS = 3
+WRITE_DELAY = 0.5
+
+
+class ConfigStore:
+    """Write-behind JSON settings file
+
+    save() only records the latest settings and returns at once; a background
+    thread writes them WRITE_DELAY seconds after the first unwritten change, so
+    a burst of changes (theme toggles, slider drags) costs at most one write
+    per WRITE_DELAY. Each write goes to a temporary file that replaces the
+    settings file, and the previous file is kept as path.1 ... path.N for
+    recovery.
+    """
+
+    def __init__(self, path, delay=WRITE_DELAY, backups=CONFIG_BACKUPS):
+        self.path = path
+        self.delay = delay
+        self.backups = backups
+        self.pending = None
+        self.writing = False
+        self.flushing = False
+        self.closed = False
+        self.condition = threading.Condition()
+        self.thread = threading.Thread(target=self._run, name="config-writer", daemon=True)
+        self.thread.start()
+
+    def backup_path(self, number):
+        return f"{self.path}.{number}"
+
+    def load(self):
+        """Return the saved settings, falling back to the newest readable backup"""
+        for number in range(self.backups + 1):
+            path = self.backup_path(number) if number else self.path
+            try:
+                with open(path, 'r', encoding='utf-8') as file:
+                    config = json.load(file)
+            except FileNotFoundError:
+                continue
+            except (OSError, ValueError) as e:
+                print(f"Error reading {path}: {e}")
+                continue
+            if isinstance(config, dict):
+                if number:
+                    print(f"Recovered settings from {path}")
+                return config
+        return {}
+
+    def save(self, config):
+        """Queue config to be written; later calls replace earlier unwritten ones"""
+        # Serialized here so the writer never sees a dict the UI is still changing
+        data = json.dumps(config)
+        with self.condition:
+            self.pending = data
+            self.condition.notify_all()
+
+    def flush(self, timeout=None):
+        """Wait until every queued save is on disk; returns False on timeout"""
+        with self.condition:
+            self.flushing = True
+            self.condition.notify_all()
+            done = self.condition.wait_for(lambda: self.pending is None and not self.writing, timeout)
+            self.flushing = False
+            return done
+
+    def close(self, timeout=5.0):
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+        self.thread.join(timeout)
+
+    def _run(self):
+        while True:
+            with self.condition:
+                self.condition.wait_for(lambda: self.pending is not None or self.closed)
+                if self.pending is None:
+                    return
+                # Give a burst of changes time to settle into the last one
+                self.condition.wait_for(lambda: self.closed or self.flushing, self.delay)
+                data, self.pending = self.pending, None
+                self.flushing = False
+                self.writing = True
+            try:
+                self._write(data)
+            except OSError as e:
+                print(f"Error saving config: {e}")
+            with self.condition:
+                self.writing = False
+                self.condition.notify_all()
+
+    def _write(self, data):
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+        if os.path.exists(self.path):
+            for number in range(self.backups, 1, -1):
+                if os.path.exists(self.backup_path(number - 1)):
+                    os.replace(self.backup_path(number - 1), self.backup_path(number))
+            if self.backups:
+                os.replace(self.path, self.backup_path(1))
+        os.replace(temp_path, self.path)
@@ -0,0 +1,206 @@
+"""Plausible wrong answers for multiple-choice questions
+
+Each meaning becomes a TF-IDF vector over its content words, once. Every term
+then keeps a short table of its nearest other meanings: cosine similarity,
+plus a bonus for sharing a part (tempo, dynamics, ...), so a tempo term is
+offered other tempo meanings. The table is cached next to the resource files
+and only rebuilt when the terms change; building a question is a lookup.
+
+Terms outside the table, such as those of term packs, are offered the most
+similar meanings of their own category, from an index built on first use.
+"""
+import hashlib
+import heapq
+import json
+import math
+import random
+
+from grading import STOP_WORDS, TOKEN_PATTERN, AnswerGrader
+from resource_bundle import write_bundle
+
+DISTRACTOR_FILE = "resource/distractors.json"
+DISTRACTOR_VERSION = 2
+NEIGHBOURS = 6
+CHOICES = 4
+CATEGORY_BONUS = 0.5
+
+
+def meaning_tokens(meaning):
+    return [token for token in TOKEN_PATTERN.findall(meaning.lower()) if token not in STOP_WORDS]
+
+
+def tfidf_vectors(meanings):
+    """Return one L2-normalized {token: weight} vector per meaning"""
+    documents = [meaning_tokens(meaning) for meaning in meanings]
+    document_frequency = {}
+    for tokens in documents:
+        for token in set(tokens):
+            document_frequency[token] = document_frequency.get(token, 0) + 1
+    count = len(documents)
+    vectors = []
+    for tokens in documents:
+        vector = {}
+        for token in tokens:
+            vector[token] = vector.get(token, 0.0) + 1.0
+        for token in vector:
+            vector[token] *= math.log((1 + count) / (1 + document_frequency[token])) + 1
+        norm = math.sqrt(sum(weight * weight for weight in vector.values())) or 1.0
+        vectors.append({token: weight / norm for token, weight in vector.items()})
+    return vectors
+
+
+def build_postings(vectors):
+    """Return {token: [(vector index, weight)]} for accumulating cosine similarities"""
+    postings = {}
+    for i, vector in enumerate(vectors):
+        for token, weight in vector.items():
+            postings.setdefault(token, []).append((i, weight))
+    return postings
+
+
+def build_neighbours(data, k=NEIGHBOURS):
+    """Return {term: [up to k terms whose meanings are most similar]}
+
+    Similarity is accumulated through a token -> postings index, so each term
+    is only compared with terms that share a word or a part with it.
+    """
+    terms = list(data["dictionary"].items())
+    index_of = {term: i for i, (term, meaning) in enumerate(terms)}
+    members = {}
+    for name, category in data.items():
+        if name == "dictionary":
+            continue
+        members[name] = [index_of[term] for term in category if term in index_of]
+    parts = [[] for _ in terms]
+    for name, indexes in members.items():
+        for i in indexes:
+            parts[i].append(name)
+
+    vectors = tfidf_vectors(meaning for term, meaning in terms)
+    postings = build_postings(vectors)
+
+    grader = AnswerGrader(meaning for term, meaning in terms)
+    neighbours = {}
+    for i, (term, meaning) in enumerate(terms):
+        scores = {}
+        for token, weight in vectors[i].items():
+            for j, other_weight in postings[token]:
+                scores[j] = scores.get(j, 0.0) + weight * other_weight
+        for name in parts[i]:
+            for j in members[name]:
+                scores[j] = scores.get(j, 0.0) + CATEGORY_BONUS
+        best = heapq.nlargest(2 * k + 1, scores.items(), key=lambda item: (item[1], -item[0]))
+        seen = {meaning}
+        chosen = []
+        for j, score in best:
+            other_meaning = terms[j][1]
+            # Duplicate meanings would give two identical buttons, and an option
+            # the grader accepts would be a second right answer
+            if other_meaning in seen or grader.grade(other_meaning, meaning):
+                continue
+            seen.add(other_meaning)
+            chosen.append(terms[j][0])
+            if len(chosen) == k:
+                break
+        neighbours[term] = chosen
+    return neighbours
+
+
+def data_key(data):
+    """Hash the dictionary and each part's dictionary terms, the only inputs to the table"""
+    dictionary = data["dictionary"]
+    parts = {name: [term for term in terms if term in dictionary] for name, terms in data.items()}
+    return hashlib.sha1(json.dumps([dictionary, parts], ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+def load_neighbours(data, path=DISTRACTOR_FILE, k=NEIGHBOURS):
+    """Load the cached neighbour table, rebuilding it when the terms changed"""
+    key = data_key(data)
+    try:
+        with open(path, 'r', encoding='utf-8') as file:
+            table = json.load(file)
+        if table['version'] == DISTRACTOR_VERSION and table['key'] == key and table['k'] == k:
+            return table['neighbours']
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    neighbours = build_neighbours(data, k)
+    try:
+        write_bundle({'version': DISTRACTOR_VERSION, 'key': key, 'k': k, 'neighbours': neighbours}, path)
+    except OSError as e:
+        print(f"Error writing distractor table: {e}")
+    return neighbours
+
+
+class DistractorIndex:
+    """Answer options for a term from the precomputed neighbour table"""
+
+    def __init__(self, data, path=DISTRACTOR_FILE, grader=None):
+        self.data = data
+        self.meanings = data["dictionary"]
+        self.neighbours = load_neighbours(data, path)
+        self.all_meanings = sorted(set(self.meanings.values()))
+        self.grader = grader or AnswerGrader(self.all_meanings)
+        # category -> (meanings, {meaning: index}, vectors, postings) for terms outside the table
+        self.categories = {}
+
+    def category_index(self, category):
+        index = self.categories.get(category)
+        if index is None:
+            meanings = sorted(set(self.data[category].values()))
+            vectors = tfidf_vectors(meanings)
+            index = (meanings, {meaning: i for i, meaning in enumerate(meanings)}, vectors, build_postings(vectors))
+            self.categories[category] = index
+        return index
+
+    def accepts(self, option, meaning):
+        """True when the grader would take option as an answer for meaning"""
+        # Known to the grader, an option that is another meaning is never taken for a typo
+        self.grader.prepare(option)
+        return self.grader.grade(option, meaning)
+
+    def similar_meanings(self, category, meaning, k=NEIGHBOURS):
+        """Return up to k of the category's meanings most similar to meaning"""
+        meanings, position, vectors, postings = self.category_index(category)
+        i = position.get(meaning)
+        if i is None:
+            return []
+        scores = {}
+        for token, weight in vectors[i].items():
+            for j, other_weight in postings[token]:
+                if j != i:
+                    scores[j] = scores.get(j, 0.0) + weight * other_weight
+        best = heapq.nlargest(2 * k + 1, scores.items(), key=lambda item: (item[1], -item[0]))
+        similar = []
+        for j, score in best:
+            if not self.accepts(meanings[j], meaning):
+                similar.append(meanings[j])
+                if len(similar) == k:
+                    break
+        return similar
+
+    def choices(self, term, meaning, count=CHOICES, rng=random, category=None):
+        """Return count shuffled meanings: the correct one and count - 1 near misses
+
+        category is the term set the question comes from; options for terms
+        outside the neighbour table are drawn from it.
+        """
+        options = [meaning]
+        if self.meanings.get(term) == meaning or category is None:
+            pool = [self.meanings[other] for other in self.neighbours.get(term, ())]
+            padding = self.all_meanings
+        else:
+            pool = self.similar_meanings(category, meaning)
+            padding = self.category_index(category)[0]
+            if len(padding) < count:
+                padding = padding + self.all_meanings
+        options += rng.sample(pool, min(count - 1, len(pool)))
+        # Terms with too few similar meanings are padded with random ones from the same category
+        attempts = 0
+        while len(options) < min(count, len(padding)) and attempts < 10 * count:
+            other = padding[rng.randrange(len(padding))]
+            # As in build_neighbours, an option the grader accepts would be a second right answer
+            if other not in options and not self.accepts(other, meaning):
+                options.append(other)
+            attempts += 1
+        rng.shuffle(options)
+        return options
@@ -0,0 +1,207 @@
+"""Tolerant answer grading against precomputed normalized alternatives
+
+A meaning such as "at a walking/medium speed" accepts "walking speed" and
+"medium speed"; "lively, quick" accepts "quick". Small typos are allowed
+through a bounded bit-parallel edit distance, budgeted per word so that
+"very quick" is never taken for "very quiet".
+
+Run from the Source directory to re-grade stored history:
+    python grading.py --regrade [--apply]
+"""
+import argparse
+import re
+
+STOP_WORDS = frozenset(["a", "an", "the", "at", "of", "to", "in", "on", "is", "it", "and", "or", "as", "be"])
+TOKEN_PATTERN = re.compile(r"[a-z0-9']+")
+PHRASE_SEPARATORS = re.compile(r",|;|/\s+|\s+/")
+PARENTHESES = re.compile(r"\(([^)]*)\)")
+
+
+def normalize(text):
+    """Lowercase, drop punctuation and stop words; keeps stop words if nothing else is left"""
+    tokens = TOKEN_PATTERN.findall(text.lower().replace("’", "'"))
+    content = [token for token in tokens if token not in STOP_WORDS]
+    return " ".join(content or tokens)
+
+
+def expand_word_choices(phrase):
+    """Expand "walking/medium speed" into "walking speed" and "medium speed" """
+    variants = [[]]
+    for word in phrase.split():
+        options = [option for option in word.split("/") if option] or [word]
+        variants = [variant + [option] for variant in variants for option in options]
+    return [" ".join(variant) for variant in variants]
+
+
+def alternatives(answer):
+    """Return every normalized form a correct answer may take"""
+    phrases = {answer, PARENTHESES.sub(" ", answer), answer.replace("(", " ").replace(")", " ")}
+    phrases.update(PARENTHESES.findall(answer))
+    for phrase in list(phrases):
+        phrases.update(PHRASE_SEPARATORS.split(phrase))
+    forms = set()
+    for phrase in phrases:
+        for variant in expand_word_choices(phrase):
+            form = normalize(variant)
+            if form:
+                forms.add(form)
+    return forms
+
+
+def max_errors(length):
+    if length <= 3:
+        return 0
+    if length <= 8:
+        return 1
+    return 2
+
+
+def pattern_masks(pattern):
+    masks = {}
+    for i, char in enumerate(pattern):
+        masks[char] = masks.get(char, 0) | (1 << i)
+    return masks
+
+
+def bounded_distance(pattern, masks, text, limit):
+    """Levenshtein distance by Myers/Hyyro bit-vectors, or limit + 1 once it must exceed limit"""
+    m = len(pattern)
+    if abs(m - len(text)) > limit:
+        return limit + 1
+    if m == 0:
+        return len(text)
+    full = (1 << m) - 1
+    last = 1 << (m - 1)
+    pv, mv, score = full, 0, m
+    remaining = len(text)
+    for char in text:
+        eq = masks.get(char, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | (~(xh | pv) & full)
+        mh = pv & xh
+        if ph & last:
+            score += 1
+        elif mh & last:
+            score -= 1
+        remaining -= 1
+        # Each remaining character can lower the score by at most one
+        if score - remaining > limit:
+            return limit + 1
+        ph = ((ph << 1) | 1) & full
+        mh = (mh << 1) & full
+        pv = mh | (~(xv | ph) & full)
+        mv = ph & xv
+    return score
+
+
+def typo_patterns(form):
+    """Return (phrase limit, [(word, masks, word limit)]) for matching a form with typos"""
+    return max_errors(len(form)), [(word, pattern_masks(word), max_errors(len(word))) for word in form.split()]
+
+
+def within_typos(limit, patterns, words):
+    """True when every word is within its own typo budget and the total within the phrase's"""
+    if not limit or len(words) != len(patterns):
+        return False
+    total = 0
+    for (pattern, masks, word_limit), word in zip(patterns, words):
+        if word == pattern:
+            continue
+        distance = bounded_distance(pattern, masks, word, word_limit) if word_limit else 1
+        total += distance
+        if distance > word_limit or total > limit:
+            return False
+    return True
+
+
+class AnswerGrader:
+    """Grades free-text answers; alternatives are computed once per meaning
+
+    A typo match is refused when the answer is exactly a form of another
+    known meaning, since the user then gave that meaning, not a misspelling.
+    """
+
+    def __init__(self, meanings=()):
+        self.entries = {}
+        self.known_forms = set()
+        for meaning in meanings:
+            self.prepare(meaning)
+
+    def prepare(self, meaning):
+        entry = self.entries.get(meaning)
+        if entry is None:
+            forms = alternatives(meaning)
+            entry = (forms, [typo_patterns(form) for form in forms])
+            self.entries[meaning] = entry
+            self.known_forms |= forms
+        return entry
+
+    def grade(self, user_answer, correct_answer):
+        if user_answer.strip().lower() == correct_answer.lower():
+            return True
+        answer = normalize(user_answer)
+        if not answer:
+            return False
+        forms, patterns = self.prepare(correct_answer)
+        if answer in forms:
+            return True
+        if answer in self.known_forms:
+            return False
+        words = answer.split()
+        return any(within_typos(limit, word_patterns, words) for limit, word_patterns in patterns)
+
+    def grade_many(self, pairs):
+        """Grade (user_answer, correct_answer) pairs in one call"""
+        return [self.grade(user_answer, correct_answer) for user_answer, correct_answer in pairs]
+
+
+def regrade_history(store, grader, apply=False, reverse_grader=None, reverse_suffix=" (Reverse)"):
+    """Re-grade every stored test that kept its answers
+
+    Returns (position, old score, new score) for each test whose score
+    changes, and writes the new scores back when apply is true. Reverse
+    (meaning -> term) tests are graded by reverse_grader, or skipped without one.
+    """
+    changes = []
+    for position, answers in store.iter_answers():
+        record = store[position]
+        test_grader = grader
+        if record['test_type'].endswith(reverse_suffix):
+            if reverse_grader is None:
+                continue
+            test_grader = reverse_grader
+        correct = sum(test_grader.grade(given, expected) for term, expected, given in answers)
+        new_score = f"{correct}/{len(answers)}"
+        if new_score != record['score']:
+            changes.append((position, record['score'], new_score))
+    if apply:
+        for position, old_score, new_score in changes:
+            correct, total = (int(part) for part in new_score.split("/"))
+            store.rescore(position, correct, total)
+        if changes:
+            store.rebuild_stats()
+    return changes
+
+
+def main():
+    from history_store import HistoryStore
+    from resource_bundle import load_bundle
+    from reverse_index import ReverseIndex
+
+    parser = argparse.ArgumentParser(description="Re-grade stored test history with the tolerant grader")
+    parser.add_argument("--regrade", action="store_true", required=True)
+    parser.add_argument("--apply", action="store_true", help="write the new scores back")
+    args = parser.parse_args()
+    data = load_bundle()
+    grader = AnswerGrader(data["dictionary"].values())
+    store = HistoryStore()
+    changes = regrade_history(store, grader, apply=args.apply, reverse_grader=ReverseIndex(data["dictionary"]))
+    for position, old_score, new_score in changes:
+        print(f"{store[position]['date']}  {store[position]['test_type']:<16} {old_score:>8} -> {new_score}")
+    print(f"{len(changes)} tests changed" + ("" if args.apply else " (not written; use --apply)"))
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,343 @@
+import json
+import sqlite3
+from datetime import datetime, timedelta
+
+HISTORY_FILE = "resource/history.db"
+PAGE_SIZE = 64
+ALL_TESTS = "All"
+ROLLING_WINDOW = 10
+PASS_PERCENT = 80.0
+TREND_PERIODS = 26
+RECORD_FIELDS = ('date', 'test_type', 'score', 'percentage')
+# Numeric copies of score and percentage, returned with every record read back
+NUMERIC_FIELDS = ('correct', 'total', 'percent')
+SORT_COLUMNS = {
+    'date': 'date',
+    'test_type': 'test_type',
+    'score': 'correct',
+    'percentage': 'percent'
+}
+
+
+def parse_score(record):
+    """Return (correct, total, percent) numbers for a record's formatted strings"""
+    try:
+        correct, total = (int(part) for part in record['score'].split('/'))
+        percent = float(record['percentage'].rstrip('%'))
+    except (KeyError, ValueError):
+        return None, None, None
+    return correct, total, percent
+
+
+def week_of(date):
+    """Return the Monday ("YYYY-MM-DD") of the week a "YYYY-MM-DD HH:MM" date falls in"""
+    try:
+        day = datetime.strptime(date[:10], "%Y-%m-%d")
+    except (TypeError, ValueError):
+        return None
+    return (day - timedelta(days=day.weekday())).strftime("%Y-%m-%d")
+
+
+class TestStats:
+    """Running totals for one test type, updated in O(1) per finished test"""
+
+    def __init__(self, tests=0, percent_sum=0.0, best=0.0, recent=(), streak=0, best_streak=0):
+        self.tests = tests
+        self.percent_sum = percent_sum
+        self.best = best
+        self.recent = list(recent)
+        self.streak = streak
+        self.best_streak = best_streak
+
+    def add(self, percent):
+        self.tests += 1
+        self.percent_sum += percent
+        self.best = max(self.best, percent)
+        self.recent.append(percent)
+        if len(self.recent) > ROLLING_WINDOW:
+            del self.recent[0]
+        # A streak is a run of consecutive tests scoring at least PASS_PERCENT
+        self.streak = self.streak + 1 if percent >= PASS_PERCENT else 0
+        self.best_streak = max(self.best_streak, self.streak)
+
+    @property
+    def mean(self):
+        return self.percent_sum / self.tests if self.tests else 0.0
+
+    @property
+    def rolling_mean(self):
+        return sum(self.recent) / len(self.recent) if self.recent else 0.0
+
+    def row(self, test_type):
+        return (test_type, self.tests, self.percent_sum, self.best, json.dumps(self.recent),
+                self.streak, self.best_streak)
+
+
+class HistoryStore:
+    """Append-only test history in a local SQLite file
+
+    Records are addressed by their position in insertion order, so the store
+    can stand in for the old test_history list: it supports len(), indexing,
+    iteration and append(). Rows are only ever appended or all cleared, which
+    keeps row ids equal to position + 1. Appends made through another
+    connection to the same file are picked up on the next read.
+    """
+
+    def __init__(self, path=HISTORY_FILE):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self.conn:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS history ("
+                "id INTEGER PRIMARY KEY, date TEXT NOT NULL, test_type TEXT NOT NULL, "
+                "score TEXT NOT NULL, percentage TEXT NOT NULL, "
+                "correct INTEGER, total INTEGER, percent REAL)"
+            )
+            self.conn.execute("CREATE INDEX IF NOT EXISTS history_date ON history(date)")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS history_type_date ON history(test_type, date)")
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS answers ("
+                "history_id INTEGER NOT NULL, term TEXT NOT NULL, expected TEXT NOT NULL, given TEXT NOT NULL)"
+            )
+            self.conn.execute("CREATE INDEX IF NOT EXISTS answers_history ON answers(history_id)")
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS history_stats ("
+                "test_type TEXT PRIMARY KEY, tests INTEGER NOT NULL, percent_sum REAL NOT NULL, "
+                "best REAL NOT NULL, recent TEXT NOT NULL, streak INTEGER NOT NULL, best_streak INTEGER NOT NULL)"
+            )
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS history_trend ("
+                "test_type TEXT NOT NULL, week TEXT NOT NULL, tests INTEGER NOT NULL, "
+                "percent_sum REAL NOT NULL, best REAL NOT NULL, PRIMARY KEY (test_type, week))"
+            )
+        self._data_version = None
+        self._page = []
+        self._sync()
+        if self._length and not self._stats:
+            # History written before aggregates existed is rolled up once
+            self.rebuild_stats()
+
+    def _sync(self):
+        """Reload the cached length and aggregates if another connection has written since"""
+        version = self.conn.execute("PRAGMA data_version").fetchone()[0]
+        if version == self._data_version:
+            return
+        self._data_version = version
+        self._length = self.conn.execute("SELECT COUNT(*) FROM history").fetchone()[0]
+        self._page_start = None
+        self._stats = {
+            row[0]: TestStats(row[1], row[2], row[3], json.loads(row[4]), row[5], row[6])
+            for row in self.conn.execute(
+                "SELECT test_type, tests, percent_sum, best, recent, streak, best_streak FROM history_stats")
+        }
+
+    def __len__(self):
+        self._sync()
+        return self._length
+
+    def __getitem__(self, position):
+        self._sync()
+        if position < 0:
+            position += self._length
+        if not 0 <= position < self._length:
+            raise IndexError("history position out of range")
+        page_start = position - position % PAGE_SIZE
+        if page_start != self._page_start:
+            rows = self.conn.execute(
+                "SELECT date, test_type, score, percentage, correct, total, percent FROM history "
+                "WHERE id > ? ORDER BY id LIMIT ?", (page_start, PAGE_SIZE)
+            ).fetchall()
+            self._page = [dict(zip(RECORD_FIELDS + NUMERIC_FIELDS, row)) for row in rows]
+            self._page_start = page_start
+        return self._page[position - page_start]
+
+    def __iter__(self):
+        cursor = self.conn.execute(
+            "SELECT date, test_type, score, percentage, correct, total, percent FROM history ORDER BY id")
+        for row in cursor:
+            yield dict(zip(RECORD_FIELDS + NUMERIC_FIELDS, row))
+
+    def _row(self, record):
+        return tuple(record[field] for field in RECORD_FIELDS) + parse_score(record)
+
+    def append(self, record):
+        self.extend([record])
+
+    def extend(self, records):
+        """Append records, and the answers they carry, in a single transaction"""
+        rows = [self._row(record) for record in records]
+        with self.conn:
+            # Taking the write lock first means no other writer can append between
+            # the sync and the inserts, so ids and aggregates build on the latest rows
+            self.conn.execute("BEGIN IMMEDIATE")
+            self._sync()
+            for row, record in zip(rows, records):
+                history_id = self.conn.execute(
+                    "INSERT INTO history (date, test_type, score, percentage, correct, total, percent) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)", row
+                ).lastrowid
+                self.conn.executemany(
+                    "INSERT INTO answers (history_id, term, expected, given) VALUES (?, ?, ?, ?)",
+                    [(history_id,) + tuple(answer) for answer in record.get('answers', ())]
+                )
+            self._add_stats((row[0], row[1], row[6]) for row in rows)
+        self._length += len(rows)
+        self._page_start = None
+
+    def _add_stats(self, results):
+        """Fold (date, test_type, percent) results into the aggregates; call inside a transaction"""
+        changed = set()
+        trend = {}
+        for date, test_type, percent in results:
+            if percent is None:
+                continue
+            week = week_of(date)
+            for key in (test_type, ALL_TESTS):
+                stats = self._stats.get(key)
+                if stats is None:
+                    stats = self._stats[key] = TestStats()
+                stats.add(percent)
+                changed.add(key)
+                if week is not None:
+                    tests, percent_sum, best = trend.get((key, week), (0, 0.0, 0.0))
+                    trend[(key, week)] = (tests + 1, percent_sum + percent, max(best, percent))
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO history_stats (test_type, tests, percent_sum, best, recent, streak, best_streak) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)", [self._stats[key].row(key) for key in changed]
+        )
+        self.conn.executemany(
+            "INSERT INTO history_trend (test_type, week, tests, percent_sum, best) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT (test_type, week) DO UPDATE SET tests = tests + excluded.tests, "
+            "percent_sum = percent_sum + excluded.percent_sum, best = MAX(best, excluded.best)",
+            [key + value for key, value in trend.items()]
+        )
+
+    def rebuild_stats(self):
+        """Recompute every aggregate from the full history, e.g. after scores were rewritten"""
+        self._stats = {}
+        with self.conn:
+            self.conn.execute("DELETE FROM history_stats")
+            self.conn.execute("DELETE FROM history_trend")
+            self._add_stats(self.conn.execute("SELECT date, test_type, percent FROM history ORDER BY id"))
+
+    def stats(self, test_type=None):
+        """Return the TestStats for a test type, or for all tests"""
+        self._sync()
+        return self._stats.get(test_type or ALL_TESTS) or TestStats()
+
+    def trend(self, test_type=None, periods=TREND_PERIODS):
+        """Return up to periods (week, tests, mean percent, best percent) rows, oldest first"""
+        rows = self.conn.execute(
+            "SELECT week, tests, percent_sum / tests, best FROM history_trend WHERE test_type = ? "
+            "ORDER BY week DESC LIMIT ?", (test_type or ALL_TESTS, periods)
+        ).fetchall()
+        rows.reverse()
+        return rows
+
+    def test_types(self):
+        """Return every test type in the history, sorted by name"""
+        return [row[0] for row in self.conn.execute("SELECT DISTINCT test_type FROM history ORDER BY test_type")]
+
+    def clear(self):
+        with self.conn:
+            self.conn.execute("DELETE FROM history")
+            self.conn.execute("DELETE FROM answers")
+            self.conn.execute("DELETE FROM history_stats")
+            self.conn.execute("DELETE FROM history_trend")
+        self._stats = {}
+        self._length = 0
+        self._page_start = None
+
+    def query(self, test_type=None, date_from=None, date_to=None, order_by=None, descending=True):
+        """Return positions of matching records, newest first unless order_by is given
+
+        date_from and date_to are prefixes of the stored "YYYY-MM-DD HH:MM" dates
+        and are both inclusive.
+        """
+        conditions = []
+        params = []
+        if test_type:
+            conditions.append("test_type = ?")
+            params.append(test_type)
+        if date_from:
+            conditions.append("date >= ?")
+            params.append(date_from)
+        if date_to:
+            conditions.append("date <= ?")
+            params.append(date_to + "\uffff")
+        sql = "SELECT id - 1 FROM history"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        direction = "DESC" if descending else "ASC"
+        if order_by:
+            sql += f" ORDER BY {SORT_COLUMNS[order_by]} {direction}, id DESC"
+        else:
+            sql += " ORDER BY id DESC"
+        return [row[0] for row in self.conn.execute(sql, params)]
+
+    def iter_answers(self):
+        """Yield (position, [[term, expected, given], ...]) for tests stored with their answers"""
+        cursor = self.conn.execute("SELECT history_id, term, expected, given FROM answers ORDER BY history_id, rowid")
+        position, answers = None, []
+        for history_id, term, expected, given in cursor:
+            if history_id - 1 != position:
+                if answers:
+                    yield position, answers
+                position, answers = history_id - 1, []
+            answers.append([term, expected, given])
+        if answers:
+            yield position, answers
+
+    def rescore(self, position, correct, total):
+        """Replace a stored test's score, e.g. after re-grading its answers"""
+        percent = (correct / total) * 100 if total else 0.0
+        with self.conn:
+            self.conn.execute(
+                "UPDATE history SET score = ?, percentage = ?, correct = ?, total = ?, percent = ? WHERE id = ?",
+                (f"{correct}/{total}", f"{percent:.1f}%", correct, total, percent, position + 1)
+            )
+        self._page_start = None
+
+    def migrate(self, records):
+        """Import history kept in the old config file, unless it was already imported"""
+        if records and not len(self):
+            self.extend(records)
+
+    def close(self):
+        self.conn.close()
+
+
+class TermStatsStore:
+    """Per-term answer statistics, kept next to the history and updated one answer at a time"""
+
+    def __init__(self, path=HISTORY_FILE):
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self.conn:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS term_stats ("
+                "term TEXT PRIMARY KEY, attempts INTEGER NOT NULL, correct INTEGER NOT NULL, "
+                "streak INTEGER NOT NULL, due REAL NOT NULL, last_seen REAL NOT NULL)"
+            )
+
+    def load(self):
+        """Return {term: (attempts, correct, streak, due, last_seen)}"""
+        rows = self.conn.execute("SELECT term, attempts, correct, streak, due, last_seen FROM term_stats")
+        return {row[0]: row[1:] for row in rows}
+
+    def save(self, term, stats):
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO term_stats (term, attempts, correct, streak, due, last_seen) "
+                "VALUES (?, ?, ?, ?, ?, ?)", (term,) + tuple(stats)
+            )
+
+    def clear(self):
+        with self.conn:
+            self.conn.execute("DELETE FROM term_stats")
+
+    def close(self):
+        self.conn.close()
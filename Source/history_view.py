@@ -0,0 +1,206 @@
+import tkinter as tk
+
+
+class VirtualTable:
+    """Scrollable table that only creates widgets for the rows currently visible
+
+    records must support len() and indexing. The rows shown are described by
+    a sequence of positions into records returned by query(sort_field,
+    descending), so sorting and filtering never touch widgets, and a fixed
+    pool of row widgets is recycled while scrolling.
+    """
+
+    def __init__(self, parent, records, columns, query, bg=None, fg=None, font=("Courier", 12), row_height=30):
+        self.records = records
+        self.query = query
+        self.columns = columns
+        self.bg = bg
+        self.fg = fg
+        self.font = font
+        self.row_height = row_height
+        self.offset = 0
+        self.rows = []
+        self.sort_field = None
+        self.sort_descending = False
+        self.view = query(None, False)
+
+        self.frame = tk.Frame(parent, bg=bg)
+        self.header = tk.Frame(self.frame, bg=bg)
+        self.header.pack(fill='x', padx=20)
+        self.header_labels = {}
+        for field, title, width in columns:
+            label = tk.Label(self.header, text=title, width=width, anchor='w',
+                             font=font + ("bold",), bg=bg, fg=fg, cursor="hand2")
+            label.pack(side='left')
+            label.bind("<Button-1>", lambda e, f=field: self.toggle_sort(f))
+            self.header_labels[field] = label
+        self.scrollbar = tk.Scrollbar(self.frame, orient="vertical", command=self.yview)
+        self.scrollbar.pack(side='right', fill='y')
+        self.body = tk.Frame(self.frame, bg=bg)
+        self.body.pack(side='left', fill='both', expand=True, padx=20)
+        self.body.bind("<Configure>", self._on_resize)
+        self._bind_wheel(self.body)
+
+    def pack(self, **kwargs):
+        self.frame.pack(**kwargs)
+
+    def set_colors(self, bg, fg):
+        """Recolour the table, including every pooled row"""
+        self.bg = bg
+        self.fg = fg
+        for widget in (self.frame, self.header, self.body):
+            widget.configure(bg=bg)
+        for label in self.header_labels.values():
+            label.configure(bg=bg, fg=fg)
+        for row, labels in self.rows:
+            row.configure(bg=bg)
+            for label in labels:
+                label.configure(bg=bg, fg=fg)
+
+    def _bind_wheel(self, widget):
+        widget.bind("<MouseWheel>", lambda e: self.scroll(-1 if e.delta > 0 else 1))
+        widget.bind("<Button-4>", lambda e: self.scroll(-1))
+        widget.bind("<Button-5>", lambda e: self.scroll(1))
+
+    def _on_resize(self, event):
+        visible = max(1, event.height // self.row_height + 1)
+        while len(self.rows) < visible:
+            row = tk.Frame(self.body, bg=self.bg)
+            labels = []
+            for field, title, width in self.columns:
+                label = tk.Label(row, width=width, anchor='w', font=self.font, bg=self.bg, fg=self.fg)
+                label.pack(side='left')
+                self._bind_wheel(label)
+                labels.append(label)
+            self._bind_wheel(row)
+            row.place(x=0, y=len(self.rows) * self.row_height, relwidth=1, height=self.row_height)
+            self.rows.append((row, labels))
+        while len(self.rows) > visible:
+            self.rows.pop()[0].destroy()
+        self.offset = max(0, min(self.offset, self._max_offset()))
+        self.render()
+
+    def _max_offset(self):
+        return max(0, len(self.view) - max(1, len(self.rows) - 1))
+
+    def render(self):
+        """Fill the pooled row widgets with the records at the current offset"""
+        for position, (row, labels) in enumerate(self.rows):
+            index = self.offset + position
+            if index < len(self.view):
+                record = self.records[self.view[index]]
+                for label, (field, title, width) in zip(labels, self.columns):
+                    label.configure(text=record[field])
+            else:
+                for label in labels:
+                    label.configure(text="")
+        total = len(self.view)
+        if total:
+            self.scrollbar.set(self.offset / total, min(1.0, (self.offset + len(self.rows) - 1) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def scroll(self, rows):
+        self.offset = max(0, min(self.offset + rows, self._max_offset()))
+        self.render()
+
+    def yview(self, action, amount, unit=None):
+        """Scrollbar command handler for 'moveto' and 'scroll' requests"""
+        if action == "moveto":
+            self.offset = max(0, min(int(float(amount) * len(self.view)), self._max_offset()))
+            self.render()
+        elif unit == "pages":
+            self.scroll(int(amount) * max(1, len(self.rows) - 1))
+        else:
+            self.scroll(int(amount))
+
+    def refresh(self):
+        """Re-run the query, e.g. after filters or the sort order changed"""
+        self.view = self.query(self.sort_field, self.sort_descending)
+        self.offset = 0
+        self.render()
+
+    def toggle_sort(self, field):
+        if self.sort_field == field:
+            self.sort_descending = not self.sort_descending
+        else:
+            self.sort_field = field
+            self.sort_descending = False
+        for name, label in self.header_labels.items():
+            title = next(t for f, t, w in self.columns if f == name)
+            if name == field:
+                title += " ▼" if self.sort_descending else " ▲"
+            label.configure(text=title)
+        self.refresh()
+
+
+class TrendChart:
+    """Canvas line chart of weekly mean scores with a one-line summary
+
+    It draws only the few rows it is given (see HistoryStore.trend and
+    HistoryStore.stats), so its cost does not depend on how long the
+    history is.
+    """
+
+    def __init__(self, parent, height=150, bg=None, fg=None, line="#4CAF50", font=("Courier", 10)):
+        self.bg = bg
+        self.fg = fg
+        self.line = line
+        self.font = font
+        self.points = []
+        self.stats = None
+        self.canvas = tk.Canvas(parent, height=height, bg=bg, highlightthickness=0)
+        self.canvas.bind("<Configure>", lambda e: self.redraw())
+
+    def pack(self, **kwargs):
+        self.canvas.pack(**kwargs)
+
+    def set_colors(self, bg, fg):
+        self.bg = bg
+        self.fg = fg
+        self.canvas.configure(bg=bg)
+        self.redraw()
+
+    def draw(self, points, stats):
+        """points are (week, tests, mean, best) rows, oldest first; stats is a TestStats"""
+        self.points = points
+        self.stats = stats
+        self.redraw()
+
+    def redraw(self):
+        canvas = self.canvas
+        canvas.delete("all")
+        width = canvas.winfo_width()
+        height = canvas.winfo_height()
+        if width < 50 or height < 50:
+            return
+        stats = self.stats
+        if stats is not None and stats.tests:
+            summary = (f"Tests {stats.tests}   Mean {stats.mean:.1f}%   Best {stats.best:.1f}%   "
+                       f"Last {len(stats.recent)} {stats.rolling_mean:.1f}%   "
+                       f"Streak {stats.streak} (best {stats.best_streak})")
+        else:
+            summary = "No tests yet"
+        canvas.create_text(10, 4, text=summary, anchor='nw', fill=self.fg, font=self.font)
+        left, top, right, bottom = 40, 24, width - 10, height - 18
+        for percent in (0, 50, 100):
+            y = bottom - (bottom - top) * percent / 100
+            canvas.create_line(left, y, right, y, fill=self.fg, dash=(2, 4))
+            canvas.create_text(left - 4, y, text=f"{percent}", anchor='e', fill=self.fg, font=self.font)
+        if not self.points:
+            return
+        step = (right - left) / max(1, len(self.points) - 1)
+        coordinates = []
+        for i, (week, tests, mean, best) in enumerate(self.points):
+            x = left + step * i if len(self.points) > 1 else (left + right) / 2
+            coordinates.append((x, bottom - (bottom - top) * mean / 100))
+            y_best = bottom - (bottom - top) * best / 100
+            canvas.create_line(x - 3, y_best, x + 3, y_best, fill=self.fg)
+        if len(coordinates) > 1:
+            canvas.create_line(*[value for point in coordinates for value in point], fill=self.line, width=2)
+        for x, y in coordinates:
+            canvas.create_oval(x - 2, y - 2, x + 2, y + 2, fill=self.line, outline=self.line)
+        canvas.create_text(left, height - 2, text=f"week of {self.points[0][0]}", anchor='sw',
+                           fill=self.fg, font=self.font)
+        if len(self.points) > 1:
+            canvas.create_text(right, height - 2, text=self.points[-1][0], anchor='se', fill=self.fg, font=self.font)
@@ -1,42 +1,57 @@
+import argparse
 import json
-import random
 import tkinter as tk
 from tkinter import messagebox, simpledialog
-import pygame
-from datetime import datetime
 import os
+from search_index import SearchIndex
+from history_view import TrendChart, VirtualTable
+from history_store import HistoryStore, TermStatsStore
+from resource_bundle import load_bundle
+from audio import AudioManager, KeySoundEngine
+from screens import ScreenManager
+from theme import ThemeManager
+from quiz_engine import PARTS, QuizEngine, question_text
+from distractors import CHOICES
+from quiz_client import RemoteQuizEngine, RemoteSession
+from scheduler import REVIEW_TEST_TYPE, ReviewScheduler, ReviewSession
+from config_store import ConfigStore
+from term_packs import discover_packs, iter_pack_chunks, pack_title
+from profiling import Profiler, ProfilerOverlay, TRACE_FILE, profile_target
 
 CONFIG_FILE = "resource/app_config.json"
+SEARCH_DEBOUNCE_MS = 120
+ANSWER_POLL_MS = 15
+RENDER_CHUNK = 500
+HISTORY_COLUMNS = [
+    ('date', "Date", 18),
+    ('test_type', "Test", 20),
+    ('score', "Score", 8),
+    ('percentage', "%", 8)
+]
 
 def load_json_files():
-    """Load and return all JSON data files from resource directory"""
-    json_files = {
-        "dictionary": "resource/dictionary.json",
-        "tempo": "resource/tempo.json",
-        "expression": "resource/expression.json", 
-        "dynamics": "resource/dynamics.json",
-        "general": "resource/general.json",
-        "articulation": "resource/articulation.json",
-        "signs": "resource/signs.json"
-    }
-    data = {}
-    for key, file_name in json_files.items():
-        with open(file_name, 'r', encoding='utf-8') as file:
-            data[key] = json.load(file)
-    return data
+    """Load and return the built-in term sets, using the compiled resource bundle
+
+    Term packs are not part of the bundle; they are streamed in after the
+    window is up (see term_packs.py).
+    """
+    return load_bundle()
 
 class App:
-    def __init__(self, root):
+    def __init__(self, root, server_url=None, profiler=None):
         """Main application class constructor"""
         self.root = root
-        self.setup_window()
-        self.initialize_sound()
-        self.load_data()
-        self.load_test_history()
-        if not hasattr(self, 'is_dark_theme'):
-            self.initialize_theme()
-        self.create_persistent_widgets()
-        self.create_main_menu()
+        self.server_url = server_url
+        self.profiler = profiler or Profiler(enabled=False)
+        for phase in (self.setup_window, self.initialize_sound, self.load_data, self.initialize_theme,
+                      self.load_test_history, self.create_persistent_widgets, self.create_screens,
+                      self.create_main_menu):
+            with self.profiler.measure("startup", phase.__name__):
+                phase()
+        if self.profiler.enabled:
+            self.profiler_overlay = ProfilerOverlay(self.root, self.profiler)
+            self.root.bind('<F12>', self.profiler_overlay.toggle)
+        self.root.after_idle(self.load_term_packs)
 
     def setup_window(self):
         self.root.title("Grade 5 Musical Terms")
@@ -47,363 +62,649 @@ class App:
         x_coordinate = int((screen_width/2) - (window_width/2))
         y_coordinate = int((screen_height/2) - (window_height/2))
         self.root.geometry(f"{window_width}x{window_height}+{x_coordinate}+{y_coordinate}")
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
 
     def initialize_sound(self):
-        """Initialize audio system and load sound effects"""
-        pygame.mixer.init()
+        """Create volume settings and load the audio system once the window is shown"""
         self.master_volume = tk.DoubleVar(value=1.0)
         self.click_volume = tk.DoubleVar(value=1.0)
         self.correct_volume = tk.DoubleVar(value=1.0)
         self.incorrect_volume = tk.DoubleVar(value=1.0)
         self.typing_volume = tk.DoubleVar(value=1.0)
-        self.click_sound = pygame.mixer.Sound("resource/click.wav")
-        self.correct_sound = pygame.mixer.Sound("resource/correct.wav")
-        self.wrong_sound = pygame.mixer.Sound("resource/wrong.wav")
-        self.typing_sound = pygame.mixer.Sound("resource/keytype.wav")
-        self.backspace_sound = pygame.mixer.Sound("resource/backspace.wav")
-        self.space_sound = pygame.mixer.Sound("resource/spacebar.wav")
+        self.audio = AudioManager()
+        self.key_sounds = KeySoundEngine(self.audio, self.master_volume, self.typing_volume)
+        self.root.after_idle(self.audio.start)
 
     def play_click_sound(self):
         volume = self.click_volume.get() * self.master_volume.get()
-        self.click_sound.set_volume(volume)
-        self.click_sound.play()
+        self.audio.play("click", volume)
 
     def play_typing_sound(self, event):
-        volume = self.typing_volume.get() * self.master_volume.get()
-        if event.keysym == 'BackSpace':
-            self.backspace_sound.set_volume(volume)
-            self.backspace_sound.play()
-        elif event.keysym == 'space':
-            self.space_sound.set_volume(volume)
-            self.space_sound.play()
-        elif event.char.isalnum():
-            self.typing_sound.set_volume(volume)
-            self.typing_sound.play()
+        self.key_sounds.on_key(event)
 
     def create_button(self, parent, text, command, **kwargs):
         def button_clicked():
             self.play_click_sound()
             command()
-        return tk.Button(parent, text=text, command=button_clicked, **kwargs)
+        button = tk.Button(parent, text=text, command=self.profiler.wrap("command", text, button_clicked), **kwargs)
+        if 'bg' not in kwargs:
+            self.themed(button, 'button')
+        return button
 
     def load_data(self):
         self.data = load_json_files()
-        self.current_test_data = None
-        self.correct_answers = 0
-        self.total_questions = 0
+        self.search_indexes = {name: SearchIndex(terms) for name, terms in self.data.items()}
+        # Term packs are filled in chunk by chunk after the window is up
+        self.packs = discover_packs(reserved=self.data)
+        self.pack_status = {}
+        self.pack_labels = {}
+        for name in self.packs:
+            self.data[name] = {}
+            self.search_indexes[name] = SearchIndex({})
+            self.pack_status[name] = "queued"
+        self.term_stats = TermStatsStore()
+        self.scheduler = ReviewScheduler(self.data["dictionary"], self.term_stats.load(), store=self.term_stats)
+        # Review sessions always run locally so every answer updates the term statistics
+        self.local_quiz = QuizEngine(self.data, on_answer=self.scheduler.record)
+        if self.server_url:
+            self.quiz = RemoteQuizEngine(self.server_url)
+        else:
+            self.quiz = self.local_quiz
+        self.session = None
+        self.answer_pending = None
+        self.auto_advance_job = None
 
     def initialize_theme(self):
-        self.is_dark_theme = True
-        self.apply_dark_theme()
-
-    def apply_dark_theme(self):
-        self.root.configure(bg='black')
-        self.button_bg = '#333333'
-        self.button_fg = 'white'
-        self.label_fg = 'white'
-        self.entry_bg = 'darkgray'
-        self.entry_fg = 'black'
-        self.update_theme_colors()
-
-    def apply_light_theme(self):
-        self.root.configure(bg='white')
-        self.button_bg = 'lightgray'
-        self.button_fg = 'black'
-        self.label_fg = 'black'
-        self.entry_bg = 'white'
-        self.entry_fg = 'black'
-        self.update_theme_colors()
-
-    def update_theme_colors(self):
-        if hasattr(self, 'persistent_frame') and self.persistent_frame.winfo_exists():
-            self.persistent_frame.configure(bg=self.root['bg'])
-            if hasattr(self, 'theme_button'):
-                self.theme_button.configure(bg=self.button_bg, fg=self.button_fg)
-            if hasattr(self, 'settings_button'):
-                self.settings_button.configure(bg=self.button_bg, fg=self.button_fg)
-        if hasattr(self, 'main_menu_frame') and self.main_menu_frame.winfo_exists():
-            self.main_menu_frame.configure(bg=self.root['bg'])
-            for widget in self.main_menu_frame.winfo_children():
-                if isinstance(widget, tk.Label):
-                    widget.configure(bg=self.root['bg'], fg=self.label_fg)
-                elif isinstance(widget, tk.Button):
-                    widget.configure(bg=self.button_bg, fg=self.button_fg)
+        self.theme = ThemeManager(self.root)
+        self.theme.apply('dark')
+
+    def themed(self, widget, role):
+        """Register a widget with the theme manager and return it"""
+        return self.theme.register(widget, role)
 
     def toggle_theme(self):
-        if self.is_dark_theme:
-            self.apply_light_theme()
-        else:
-            self.apply_dark_theme()
-        self.is_dark_theme = not self.is_dark_theme
+        self.select_theme(self.theme.next_name())
+
+    def select_theme(self, name):
+        self.theme.apply(name)
+        if hasattr(self, 'theme_choice'):
+            self.theme_choice.set(name)
         self.save_test_history()
         self.update_theme_button()
 
     def update_theme_button(self):
-        theme_icon = "🌞" if self.is_dark_theme else "🌙"
+        theme_icon = self.theme.colors['icon']
         self.theme_button.config(text=f"{theme_icon} Theme")
 
     def create_persistent_widgets(self):
-        self.persistent_frame = tk.Frame(self.root, bg=self.root['bg'])
+        self.persistent_frame = self.themed(tk.Frame(self.root), 'frame')
         self.persistent_frame.pack(fill='x', pady=5, padx=5)
         self.theme_button = self.create_button(
             self.persistent_frame, 
             text="🌓 Toggle Theme", 
             command=self.toggle_theme,
-            font=("Times", 12),
-            bg=self.button_bg,
-            fg=self.button_fg
+            font=("Times", 12)
         )
         self.theme_button.pack(side='left', padx=5)
         self.settings_button = self.create_button(
             self.persistent_frame, 
             text="⚙ Settings", 
             command=self.show_settings_menu,
-            font=("Times", 12),
-            bg=self.button_bg,
-            fg=self.button_fg
+            font=("Times", 12)
         )
         self.settings_button.pack(side='right', padx=5)
 
+    def create_screens(self):
+        self.screens = ScreenManager(self.root, self.theme, self.profiler)
+        self.screens.register('main_menu', self.build_main_menu)
+        self.screens.register('start_test', self.build_start_test_menu)
+        self.screens.register('test_by_parts', self.build_test_by_parts_menu)
+        self.screens.register('question', self.build_question_screen, on_hide=self.hide_question_screen)
+        self.screens.register('results', self.build_results_screen)
+        self.screens.register('view_dictionary', self.build_view_dictionary_menu)
+        self.screens.register('view_by_parts', self.build_view_by_parts_menu)
+        self.screens.register('packs', self.build_packs_menu)
+        self.screens.register('dictionary', self.build_dictionary_screen, on_show=self.load_dictionary_part)
+        self.screens.register('history', self.build_history_screen, on_show=self.refresh_history)
+        self.screens.register('settings', self.build_settings_menu)
+
     def create_main_menu(self):
-        self.clear_window()
-        self.main_menu_frame = tk.Frame(self.root, bg=self.root['bg'])
-        self.main_menu_frame.pack(expand=True, fill='both')
-        tk.Label(self.main_menu_frame, text="--- Musical Terms.exe ---", 
-                font=("Times", 24), bg=self.root['bg'], fg=self.label_fg).pack(pady=10, expand=True)
+        self.screens.show('main_menu')
+
+    def build_main_menu(self, frame):
+        self.main_menu_frame = frame
+        self.themed(tk.Label(self.main_menu_frame, text="--- Musical Terms.exe ---", 
+                font=("Times", 24)), 'label').pack(pady=10, expand=True)
         self.create_button(
             self.main_menu_frame, 
             text="Start Test", 
             command=self.start_test_menu, 
             width=30, 
-            font=("Times", 16), 
-            bg=self.button_bg, 
-            fg=self.button_fg
+            font=("Times", 16)
         ).pack(pady=5, expand=True)
         self.create_button(
             self.main_menu_frame, 
             text="View Dictionary", 
             command=self.view_dictionary_menu, 
             width=30, 
-            font=("Times", 16), 
-            bg=self.button_bg, 
-            fg=self.button_fg
+            font=("Times", 16)
         ).pack(pady=5, expand=True)
         self.create_button(
             self.main_menu_frame, 
             text="Test History", 
             command=self.view_test_history, 
             width=30, 
-            font=("Times", 16), 
-            bg=self.button_bg, 
-            fg=self.button_fg
+            font=("Times", 16)
         ).pack(pady=5, expand=True)
         self.create_button(
             self.main_menu_frame, 
             text="Exit", 
-            command=self.root.quit, 
+            command=self.on_close, 
             width=30, 
-            font=("Times", 16), 
-            bg=self.button_bg, 
-            fg=self.button_fg
+            font=("Times", 16)
         ).pack(pady=5, expand=True)
 
     def start_test_menu(self):
-        self.clear_window()
-        tk.Label(self.root, text="--- Start Test ---", font=("Times", 24), bg=self.root['bg'], fg=self.label_fg).pack(pady=10, expand=True)
-        self.create_button(self.root, text="Complete Test", 
-                          command=lambda: self.run_test(self.data["dictionary"], "Complete Test"), 
-                          width=30, font=("Times", 16), bg=self.button_bg, fg=self.button_fg).pack(pady=5, expand=True)
-        self.create_button(self.root, text="Test by Parts", command=self.test_by_parts_menu,
-                          width=30, font=("Times", 16), bg=self.button_bg, fg=self.button_fg).pack(pady=5, expand=True)
-        self.create_button(self.root, text="Back", command=self.create_main_menu,
-                          width=30, font=("Times", 16), bg=self.button_bg, fg=self.button_fg).pack(pady=5, expand=True)
+        self.screens.show('start_test')
+
+    def build_start_test_menu(self, frame):
+        self.themed(tk.Label(frame, text="--- Start Test ---", font=("Times", 24)), 'label').pack(pady=10, expand=True)
+        self.create_button(frame, text="Complete Test", 
+                          command=lambda: self.run_test("dictionary", "Complete Test"), 
+                          width=30, font=("Times", 16)).pack(pady=5, expand=True)
+        self.create_button(frame, text="Test by Parts", command=self.test_by_parts_menu,
+                          width=30, font=("Times", 16)).pack(pady=5, expand=True)
+        self.create_button(frame, text="Review (Spaced Repetition)", command=self.run_review,
+                          width=30, font=("Times", 16)).pack(pady=5, expand=True)
+        self.themed(tk.Checkbutton(frame, text="Multiple choice answers", variable=self.multiple_choice,
+                                   font=("Times", 14)), 'check').pack(pady=5, expand=True)
+        self.themed(tk.Checkbutton(frame, text="Reverse: name the term for a meaning", variable=self.reverse_mode,
+                                   font=("Times", 14)), 'check').pack(pady=5, expand=True)
+        self.create_button(frame, text="Back", command=self.create_main_menu,
+                          width=30, font=("Times", 16)).pack(pady=5, expand=True)
 
     def test_by_parts_menu(self):
-        self.clear_window()
-        tk.Label(self.root, text="--- Test by Parts ---", font=("Times", 24), bg=self.root['bg'], fg=self.label_fg).pack(pady=10, expand=True)
-        parts = {
-            "Tempo": "tempo",
-            "Expression": "expression",
-            "Dynamics": "dynamics",
-            "General": "general",
-            "Articulation": "articulation",
-            "Signs": "signs"
-        }
-        for part_name, part_key in parts.items():
-            self.create_button(self.root, text=part_name, 
-                              command=lambda k=part_key, n=part_name: self.run_test(self.data[k], n),
-                              width=30, font=("Times", 16), bg=self.button_bg, fg=self.button_fg).pack(pady=5, expand=True)
-        self.create_button(self.root, text="Back", command=self.start_test_menu,
-                          width=30, font=("Times", 16), bg=self.button_bg, fg=self.button_fg).pack(pady=5, expand=True)
-
-    def run_test(self, test_data, test_type="Unknown"):
-        self.clear_window()
-        self.current_test_data = list(test_data.items())
-        self.current_test_type = test_type
-        random.shuffle(self.current_test_data)
-        self.correct_answers = 0
-        self.total_questions = len(self.current_test_data)
-        self.current_question_number = 0
+        self.screens.show('test_by_parts')
+
+    def build_test_by_parts_menu(self, frame):
+        self.themed(tk.Label(frame, text="--- Test by Parts ---", font=("Times", 24)), 'label').pack(pady=10, expand=True)
+        for part_name, part_key in PARTS.items():
+            self.create_button(frame, text=part_name, 
+                              command=lambda k=part_key, n=part_name: self.run_test(k, n),
+                              width=30, font=("Times", 16)).pack(pady=5, expand=True)
+        self.create_button(frame, text="Back", command=self.start_test_menu,
+                          width=30, font=("Times", 16)).pack(pady=5, expand=True)
+
+    def run_test(self, category, test_type="Unknown", quiz=None):
+        self.release_session()
+        try:
+            self.session = (quiz or self.quiz).start(category, test_type, multiple_choice=self.multiple_choice.get(),
+                                           reverse=self.reverse_mode.get())
+        except OSError as e:
+            self.show_server_error(e)
+            return
+        self.auto_advance_job = None
+        self.next_question()
+
+    def run_review(self):
+        self.release_session()
+        self.session = ReviewSession(self.scheduler, self.local_quiz.grader.grade)
+        self.auto_advance_job = None
         self.next_question()
 
+    def build_question_screen(self, frame):
+        self.progress_label = self.themed(tk.Label(frame, text="", font=("Times", 14)), 'label')
+        self.progress_label.pack(pady=5, anchor='nw')
+        self.question_label = self.themed(tk.Label(frame, text="", font=("Times", 20), wraplength=700), 'label')
+        self.question_label.pack(pady=10, expand=True)
+        self.answer_entry = self.themed(tk.Entry(frame, width=60, font=("Times", 16)), 'entry')
+        self.answer_entry.pack(pady=10, expand=True)
+        self.answer_entry.bind("<Return>", self.profiler.wrap("key", "answer <Return>", lambda event: self.check_answer()))
+        self.answer_entry.bind("<Key>", self.profiler.wrap("key", "answer <Key>", self.play_typing_sound))
+        # Shown in place of the entry for multiple-choice questions
+        self.choice_frame = self.themed(tk.Frame(frame), 'frame')
+        self.choice_buttons = []
+        for i in range(CHOICES):
+            button = self.create_button(self.choice_frame, text="", command=lambda i=i: self.choose_answer(i),
+                                        width=60, font=("Times", 16))
+            button.pack(pady=3)
+            self.choice_buttons.append(button)
+        self.feedback_label = self.themed(tk.Label(frame, text="", font=("Times", 16)), 'feedback')
+        self.feedback_label.pack(pady=5, expand=True)
+        self.submit_button = self.create_button(frame, text="Submit", command=self.check_answer,
+                          width=30, font=("Times", 16))
+        self.submit_button.pack(pady=5, expand=True)
+        self.create_button(frame, text="Exit Test", command=self.exit_test,
+                          width=30, font=("Times", 16)).pack(pady=5, expand=True)
+
     def next_question(self):
-        if not self.current_test_data:
+        self.cancel_auto_advance()
+        if self.session.next() is None:
             self.show_results()
             return
-        self.clear_window()
-        self.current_question_number += 1
-        progress_text = f"Question {self.current_question_number}/{self.total_questions}"
-        tk.Label(self.root, text=progress_text, font=("Times", 14), 
-                bg=self.root['bg'], fg=self.label_fg).pack(pady=5, anchor='nw')
-        self.current_question = self.current_test_data.pop()
-        key, value = self.current_question
-        tk.Label(self.root, text=f"What is the meaning of '{key}'?", font=("Times", 20), bg=self.root['bg'], fg=self.label_fg).pack(pady=10, expand=True)
-        self.answer_entry = tk.Entry(self.root, width=60, font=("Times", 16), bg=self.entry_bg, fg=self.entry_fg)
-        self.answer_entry.pack(pady=10, expand=True)
-        self.answer_entry.bind("<Return>", lambda event: self.check_answer())
-        self.answer_entry.bind("<Key>", lambda e: self.play_typing_sound(e))
-        self.answer_entry.focus_set()
-        self.create_button(self.root, text="Submit", command=self.check_answer,
-                          width=30, font=("Times", 16), bg=self.button_bg, fg=self.button_fg).pack(pady=5, expand=True)
-        self.create_button(self.root, text="Exit Test", command=self.create_main_menu,
-                          width=30, font=("Times", 16), bg=self.button_bg, fg=self.button_fg).pack(pady=5, expand=True)
-        self.root.bind('<Escape>', lambda event: self.create_main_menu())
-
-    def check_answer(self):
-        user_answer = self.answer_entry.get().strip()
-        key, correct_answer = self.current_question
-        if user_answer.lower() == correct_answer.lower():
-            self.correct_answers += 1
+        key, value = self.session.current
+        self.screens.show('question')
+        # The question screen is reused, so moving on only updates its text in place
+        self.progress_label.configure(text=f"Question {self.session.number}/{self.session.total}")
+        text = question_text(self.session, key)
+        if self.session.reverse and self.local_quiz.reverse_index.is_ambiguous(key):
+            text += "\n(several terms have this meaning; any of them is accepted)"
+        self.question_label.configure(text=text)
+        self.feedback_label.configure(text="")
+        self.submit_button.configure(text="Submit")
+        self.answered = False
+        choices = self.session.choices
+        if choices:
+            self.answer_entry.pack_forget()
+            self.choice_frame.pack(pady=10, expand=True, before=self.feedback_label)
+            for i, button in enumerate(self.choice_buttons):
+                if i < len(choices):
+                    button.configure(text=choices[i], state='normal')
+                    button.pack(pady=3)
+                else:
+                    button.pack_forget()
+            self.root.focus_set()
+        else:
+            self.choice_frame.pack_forget()
+            self.answer_entry.pack(pady=10, expand=True, before=self.feedback_label)
+            self.answer_entry.configure(state='normal')
+            self.answer_entry.delete(0, 'end')
+            self.answer_entry.focus_set()
+        self.root.bind('<Escape>', self.profiler.wrap("key", "<Escape>", lambda event: self.exit_test()))
+
+    def choose_answer(self, index):
+        if not self.answered:
+            self.check_answer(self.session.choices[index])
+
+    def check_answer(self, user_answer=None):
+        if self.answered:
+            # Submitting again after inline feedback moves on straight away
+            self.next_question()
+            return
+        if self.answer_pending is not None:
+            return
+        if user_answer is None:
+            if self.session.choices:
+                return
+            user_answer = self.answer_entry.get()
+        if isinstance(self.session, RemoteSession):
+            # A round trip to the server runs off the UI thread; the answer is shown when it arrives
+            self.answer_pending = self.session.answer_async(user_answer)
+            self.wait_for_answer(self.session, self.answer_pending)
+            return
+        correct, correct_answer = self.session.answer(user_answer)
+        self.show_answer(correct, correct_answer)
+
+    def wait_for_answer(self, session, future):
+        if not future.done():
+            self.root.after(ANSWER_POLL_MS, self.wait_for_answer, session, future)
+            return
+        self.answer_pending = None
+        if session is not self.session or self.screens.current != 'question':
+            # The test was left while the answer was on its way
+            return
+        try:
+            correct, correct_answer = future.result()
+        except OSError as e:
+            self.show_server_error(e)
+            return
+        self.show_answer(correct, correct_answer)
+
+    def show_answer(self, correct, correct_answer):
+        if correct:
             volume = self.correct_volume.get() * self.master_volume.get()
-            self.correct_sound.set_volume(volume)
-            self.correct_sound.play()
-            messagebox.showinfo("Correct!", "✅ Correct!")
+            self.audio.play("correct", volume)
         else:
             volume = self.incorrect_volume.get() * self.master_volume.get()
-            self.wrong_sound.set_volume(volume)
-            self.wrong_sound.play()
-            messagebox.showinfo("Incorrect", f"❌ Incorrect. The correct answer is: {correct_answer}")
-        self.next_question()
+            self.audio.play("wrong", volume)
+        if not self.inline_feedback.get():
+            if correct:
+                messagebox.showinfo("Correct!", "✅ Correct!")
+            else:
+                messagebox.showinfo("Incorrect", f"❌ Incorrect. The correct answer is: {correct_answer}")
+            self.next_question()
+            return
+        self.answered = True
+        if correct:
+            self.feedback_label.configure(text="✅ Correct!", fg="#4CAF50")
+        else:
+            self.feedback_label.configure(text=f"❌ Incorrect. The correct answer is: {correct_answer}", fg="#f44336")
+        self.answer_entry.configure(state='readonly')
+        for button in self.choice_buttons:
+            button.configure(state='disabled')
+        self.submit_button.configure(text="Next")
+        delay = self.auto_advance.get()
+        if delay > 0:
+            self.auto_advance_job = self.root.after(int(delay * 1000), self.next_question)
+
+    def show_server_error(self, error):
+        messagebox.showerror("Server Unavailable", f"Could not reach the quiz server:\n{error}")
+        self.exit_test()
+
+    def cancel_auto_advance(self):
+        if self.auto_advance_job is not None:
+            self.root.after_cancel(self.auto_advance_job)
+            self.auto_advance_job = None
+
+    def hide_question_screen(self):
+        # Leaving through the persistent Settings button must not be undone by a pending advance
+        self.root.unbind('<Escape>')
+        self.cancel_auto_advance()
+
+    def exit_test(self):
+        self.cancel_auto_advance()
+        self.release_session()
+        self.create_main_menu()
+
+    def release_session(self):
+        # The server would otherwise keep a left thin-client test until its idle sweep
+        if isinstance(self.session, RemoteSession):
+            self.session.abandon()
 
     def show_results(self):
-        test_record = {
-            'date': datetime.now().strftime("%Y-%m-%d %H:%M"),
-            'test_type': self.current_test_type,
-            'score': f"{self.correct_answers}/{self.total_questions}",
-            'percentage': f"{(self.correct_answers/self.total_questions)*100:.1f}%"
-        }
-        self.test_history.append(test_record)
-        self.save_test_history()
-        self.clear_window()
-        tk.Label(self.root, text="Test Complete!", font=("Times", 24), bg=self.root['bg'], fg=self.label_fg).pack(pady=10, expand=True)
-        tk.Label(self.root, text=f"Score: {self.correct_answers}/{self.total_questions}", font=("Times", 20), bg=self.root['bg'], fg=self.label_fg).pack(pady=10, expand=True)
-        self.create_button(self.root, text="Back to Main Menu", command=self.create_main_menu,
-                          width=30, font=("Times", 16), bg=self.button_bg, fg=self.button_fg).pack(pady=5, expand=True)
+        # A session without questions is not a test taken, and the server keeps its own history
+        if self.session.total and not isinstance(self.session, RemoteSession):
+            self.test_history.append(self.session.record())
+        self.screens.show('results')
+        self.results_score_label.configure(text=f"Score: {self.session.correct}/{self.session.total}")
+
+    def build_results_screen(self, frame):
+        self.themed(tk.Label(frame, text="Test Complete!", font=("Times", 24)), 'label').pack(pady=10, expand=True)
+        self.results_score_label = self.themed(tk.Label(frame, text="", font=("Times", 20)), 'label')
+        self.results_score_label.pack(pady=10, expand=True)
+        self.create_button(frame, text="Back to Main Menu", command=self.create_main_menu,
+                          width=30, font=("Times", 16)).pack(pady=5, expand=True)
 
     def view_dictionary_menu(self):
-        self.clear_window()
-        tk.Label(self.root, text="--- View Dictionary ---", font=("Times", 24), bg=self.root['bg'], fg=self.label_fg).pack(pady=10, expand=True)
-        self.create_button(self.root, text="View Complete Dictionary", command=lambda: self.show_dictionary(self.data["dictionary"]),
-                          width=30, font=("Times", 16), bg=self.button_bg, fg=self.button_fg).pack(pady=5, expand=True)
-        self.create_button(self.root, text="View by Parts", command=self.view_by_parts_menu,
-                          width=30, font=("Times", 16), bg=self.button_bg, fg=self.button_fg).pack(pady=5, expand=True)
-        self.create_button(self.root, text="Back", command=self.create_main_menu,
-                          width=30, font=("Times", 16), bg=self.button_bg, fg=self.button_fg).pack(pady=5, expand=True)
+        self.screens.show('view_dictionary')
+
+    def build_view_dictionary_menu(self, frame):
+        self.themed(tk.Label(frame, text="--- View Dictionary ---", font=("Times", 24)), 'label').pack(pady=10, expand=True)
+        self.create_button(frame, text="View Complete Dictionary", command=lambda: self.show_dictionary("dictionary"),
+                          width=30, font=("Times", 16)).pack(pady=5, expand=True)
+        self.create_button(frame, text="View by Parts", command=self.view_by_parts_menu,
+                          width=30, font=("Times", 16)).pack(pady=5, expand=True)
+        if self.packs:
+            self.create_button(frame, text="Term Packs", command=self.packs_menu,
+                              width=30, font=("Times", 16)).pack(pady=5, expand=True)
+        self.create_button(frame, text="Back", command=self.create_main_menu,
+                          width=30, font=("Times", 16)).pack(pady=5, expand=True)
 
     def view_by_parts_menu(self):
-        self.clear_window()
-        tk.Label(self.root, text="--- View by Parts ---", font=("Times", 24), bg=self.root['bg'], fg=self.label_fg).pack(pady=10, expand=True)
-        parts = {
-            "Tempo": "tempo",
-            "Expression": "expression",
-            "Dynamics": "dynamics",
-            "General": "general",
-            "Articulation": "articulation",
-            "Signs": "signs"
-        }
-        for part_name, part_key in parts.items():
-            self.create_button(self.root, text=part_name, command=lambda k=part_key: self.show_dictionary(self.data[k]),
-                             width=30, font=("Times", 16), bg=self.button_bg, fg=self.button_fg).pack(pady=5, expand=True)
-        self.create_button(self.root, text="Back", command=self.view_dictionary_menu,
-                          width=30, font=("Times", 16), bg=self.button_bg, fg=self.button_fg).pack(pady=5, expand=True)
-
-    def show_dictionary(self, dictionary):
-        self.clear_window()
-        tk.Label(self.root, text="Dictionary Content", font=("Times", 24), bg=self.root['bg'], fg=self.label_fg).pack(pady=10, expand=True)
-        search_frame = tk.Frame(self.root, bg=self.root['bg'])
+        self.screens.show('view_by_parts')
+
+    def build_view_by_parts_menu(self, frame):
+        self.themed(tk.Label(frame, text="--- View by Parts ---", font=("Times", 24)), 'label').pack(pady=10, expand=True)
+        for part_name, part_key in PARTS.items():
+            self.create_button(frame, text=part_name, command=lambda k=part_key: self.show_dictionary(k),
+                             width=30, font=("Times", 16)).pack(pady=5, expand=True)
+        self.create_button(frame, text="Back", command=self.view_dictionary_menu,
+                          width=30, font=("Times", 16)).pack(pady=5, expand=True)
+
+    def packs_menu(self):
+        self.screens.show('packs')
+
+    def build_packs_menu(self, frame):
+        self.themed(tk.Label(frame, text="--- Term Packs ---", font=("Times", 24)), 'label').pack(pady=10, expand=True)
+        grid = self.themed(tk.Frame(frame), 'frame')
+        grid.pack(expand=True)
+        for row, name in enumerate(self.packs):
+            label = self.themed(tk.Label(grid, text="", font=("Times", 16), anchor='w', width=32), 'label')
+            label.grid(row=row, column=0, padx=10, pady=5)
+            self.pack_labels[name] = label
+            self.update_pack_label(name)
+            self.create_button(grid, text="View", command=lambda k=name: self.show_dictionary(k),
+                              width=8, font=("Times", 14)).grid(row=row, column=1, padx=5)
+            self.create_button(grid, text="Test", command=lambda k=name: self.run_pack_test(k),
+                              width=8, font=("Times", 14)).grid(row=row, column=2, padx=5)
+        self.create_button(frame, text="Back", command=self.view_dictionary_menu,
+                          width=30, font=("Times", 16)).pack(pady=5, expand=True)
+
+    def update_pack_label(self, name):
+        label = self.pack_labels.get(name)
+        if label is not None:
+            status = self.pack_status[name]
+            suffix = "" if status == "loaded" else f" ({status})"
+            label.configure(text=f"{pack_title(name)}: {len(self.data[name]):,} terms{suffix}")
+
+    def run_pack_test(self, name):
+        if self.pack_status[name] != "loaded":
+            messagebox.showinfo("Still Loading", f"{pack_title(name)} has not finished loading yet.")
+            return
+        if not self.data[name]:
+            messagebox.showinfo("Empty Pack", f"{pack_title(name)} has no terms to test.")
+            return
+        if self.reverse_mode.get():
+            # Reverse questions come from the dictionary's meaning index, which packs are not part of
+            messagebox.showinfo("Reverse Mode", "Reverse mode only covers the built-in dictionary.\n"
+                                "Turn off reverse mode on the Start Test menu to test this pack.")
+            return
+        # Packs are only on this machine, so they are tested locally even when connected to a server
+        self.run_test(name, pack_title(name), quiz=self.local_quiz)
+
+    def run_in_chunks(self, steps):
+        """Advance a generator one step per event-loop turn, so redraws and input run in between"""
+        def step():
+            if next(steps, None) is not None:
+                self.root.after_idle(self.root.after, 0, step)
+        step()
+
+    def load_term_packs(self):
+        self.run_in_chunks(self.stream_term_packs())
+
+    def stream_term_packs(self):
+        """Load the discovered packs one chunk at a time"""
+        for name, path in self.packs.items():
+            terms = self.data[name]
+            index = self.search_indexes[name]
+            self.pack_status[name] = "loading"
+            try:
+                for chunk in iter_pack_chunks(path):
+                    new_entries = [(term, meaning) for term, meaning in chunk if term not in terms]
+                    terms.update(new_entries)
+                    index.add(new_entries)
+                    self.update_pack_label(name)
+                    if self.screens.current == 'dictionary' and self.search_index is index and self.search_job is None:
+                        # Throttled rather than debounced, so the view keeps up while the pack streams in
+                        self.search_job = self.root.after(SEARCH_DEBOUNCE_MS, self.timed_update_search)
+                    yield True
+                self.pack_status[name] = "loaded"
+            except (OSError, ValueError) as e:
+                print(f"Error loading term pack {path}: {e}")
+                self.pack_status[name] = "error"
+            self.update_pack_label(name)
+
+    def show_dictionary(self, part_key):
+        self.screens.show('dictionary', part_key)
+
+    def build_dictionary_screen(self, frame):
+        self.themed(tk.Label(frame, text="Dictionary Content", font=("Times", 24)), 'label').pack(pady=10, expand=True)
+        search_frame = self.themed(tk.Frame(frame), 'frame')
         search_frame.pack(fill="x", padx=20, pady=10)
-        tk.Label(search_frame, text="Search:", font=("Times", 16), bg=self.root['bg'], fg=self.label_fg).pack(side="left", padx=10)
-        search_entry = tk.Entry(search_frame, font=("Times", 16), bg=self.entry_bg, fg=self.entry_fg)
-        search_entry.pack(side="left", fill="x", expand=True, padx=10)
-        search_entry.bind("<Key>", lambda e: self.play_typing_sound(e))
-        content_frame = tk.Frame(self.root, bg=self.root['bg'])
+        self.themed(tk.Label(search_frame, text="Search:", font=("Times", 16)), 'label').pack(side="left", padx=10)
+        self.search_entry = self.themed(tk.Entry(search_frame, font=("Times", 16)), 'entry')
+        self.search_entry.pack(side="left", fill="x", expand=True, padx=10)
+        self.search_entry.bind("<Key>", self.profiler.wrap("key", "search <Key>", self.play_typing_sound))
+        self.search_entry.bind('<KeyRelease>', self.profiler.wrap("key", "search <KeyRelease>", self.schedule_search))
+        self.timed_update_search = self.profiler.wrap("callback", "update_search", self.update_search)
+        content_frame = self.themed(tk.Frame(frame), 'frame')
         content_frame.pack(fill="both", expand=True, padx=20, pady=10)
-        text_widget = tk.Text(content_frame, wrap="word", font=("Courier", 14), bg=self.root['bg'], fg=self.label_fg)
-        text_widget.pack(pady=10, padx=10, fill="both", expand=True)
-        text_widget.tag_configure("bold", font=("Courier", 14, "bold"), foreground=self.label_fg)
-        def update_search(*args):
-            search_term = search_entry.get().strip().lower()
-            text_widget.config(state="normal")
-            text_widget.delete(1.0, "end")
-            max_key_length = max(len(key) for key in dictionary.keys())
-            for key, value in dictionary.items():
-                if search_term in key.lower() or search_term in value.lower():
-                    formatted_key = f"{key:<{max_key_length}}"
-                    text_widget.insert("end", f"{formatted_key} = ", "bold")
-                    text_widget.insert("end", f"{value}\n")
-            text_widget.config(state="disabled")
-        search_entry.bind('<KeyRelease>', update_search)
-        update_search()
         self.create_button(content_frame, text="Back", command=self.view_dictionary_menu,
-                          width=30, font=("Times", 16), bg=self.button_bg, fg=self.button_fg).pack(pady=5, side="bottom")
+                          width=30, font=("Times", 16)).pack(pady=5, side="bottom")
+        self.dictionary_text = self.themed(tk.Text(content_frame, wrap="word", font=("Courier", 14)), 'text')
+        self.dictionary_text.pack(pady=10, padx=10, fill="both", expand=True)
+        self.dictionary_text.tag_configure("bold", font=("Courier", 14, "bold"))
+        self.search_job = None
+        self.shown_ids = []
+        self.rendered_width = 0
+        self.render_steps = None
+
+    def load_dictionary_part(self, part_key):
+        """Point the cached dictionary screen at another term set and redraw it"""
+        if self.search_job is not None:
+            self.root.after_cancel(self.search_job)
+            self.search_job = None
+        self.search_index = self.search_indexes[part_key]
+        self.search_entry.delete(0, 'end')
+        self.stop_render()
+        self.clear_dictionary_text()
+        self.update_search()
+
+    def clear_dictionary_text(self):
+        self.dictionary_text.config(state="normal")
+        self.dictionary_text.delete(1.0, "end")
+        self.shown_ids = []
+        self.rendered_width = self.search_index.max_key_length
+
+    def schedule_search(self, *args):
+        if self.search_job is not None:
+            self.root.after_cancel(self.search_job)
+        self.search_job = self.root.after(SEARCH_DEBOUNCE_MS, self.timed_update_search)
+
+    def update_search(self):
+        self.search_job = None
+        self.stop_render()
+        index = self.search_index
+        if index.max_key_length != self.rendered_width:
+            # A longer term widens the padding, so lines drawn at the old width are redrawn
+            self.clear_dictionary_text()
+        self.render_steps = self.render_search(index, index.search(self.search_entry.get()))
+        self.run_in_chunks(self.render_steps)
+
+    def render_search(self, index, new_ids):
+        """Turn the shown lines into new_ids, pausing after every RENDER_CHUNK inserted lines
+
+        self.shown_ids always matches the text, so a newer search can take over
+        from wherever this one stopped.
+        """
+        text_widget = self.dictionary_text
+        shown_ids = self.shown_ids
+        done = []
+        budget = RENDER_CHUNK
+        text_widget.config(state="normal")
+        # Both id lists are ascending, so merge them and only touch the lines that changed
+        line, i, j = 1, 0, 0
+        while i < len(shown_ids) or j < len(new_ids):
+            if j == len(new_ids) or (i < len(shown_ids) and shown_ids[i] < new_ids[j]):
+                start = i
+                while i < len(shown_ids) and (j == len(new_ids) or shown_ids[i] < new_ids[j]):
+                    i += 1
+                text_widget.delete(f"{line}.0", f"{line + i - start}.0")
+            elif i == len(shown_ids) or new_ids[j] < shown_ids[i]:
+                start = j
+                while j < len(new_ids) and (i == len(shown_ids) or new_ids[j] < shown_ids[i]) and j - start < budget:
+                    j += 1
+                args = []
+                for entry_id in new_ids[start:j]:
+                    formatted_key, value = index.format_entry(entry_id)
+                    args.extend((f"{formatted_key} = ", "bold", f"{value}\n", ()))
+                text_widget.insert(f"{line}.0", *args)
+                line += j - start
+                done.extend(new_ids[start:j])
+                budget -= j - start
+                if budget == 0:
+                    self.shown_ids = done + list(shown_ids[i:])
+                    text_widget.config(state="disabled")
+                    yield True
+                    text_widget.config(state="normal")
+                    budget = RENDER_CHUNK
+            else:
+                done.append(new_ids[j])
+                line += 1
+                i += 1
+                j += 1
+        self.shown_ids = new_ids
+        self.render_steps = None
+        text_widget.config(state="disabled")
+
+    def stop_render(self):
+        if self.render_steps is not None:
+            self.render_steps.close()
+            self.render_steps = None
 
     def view_test_history(self):
-        self.clear_window()
-        tk.Label(self.root, text="Test History", font=("Times", 24), 
-                bg=self.root['bg'], fg=self.label_fg).pack(pady=10)
-        canvas = tk.Canvas(self.root, bg=self.root['bg'])
-        scrollbar = tk.Scrollbar(self.root, orient="vertical", command=canvas.yview)
-        scroll_frame = tk.Frame(canvas, bg=self.root['bg'])
-        scroll_frame.bind("<Configure>", lambda e: canvas.configure(
-            scrollregion=canvas.bbox("all")
-        ))
-        canvas.create_window((0, 0), window=scroll_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
-        for record in reversed(self.test_history):
-            frame = tk.Frame(scroll_frame, bg=self.root['bg'])
-            frame.pack(fill='x', pady=5, padx=20)
-            tk.Label(frame, text=record['date'], width=18, anchor='w',
-                    font=("Courier", 12), bg=self.root['bg'], fg=self.label_fg).pack(side='left')
-            tk.Label(frame, text=record['test_type'], width=20, anchor='w',
-                    font=("Courier", 12), bg=self.root['bg'], fg=self.label_fg).pack(side='left')
-            tk.Label(frame, text=record['score'], width=8, anchor='w',
-                    font=("Courier", 12), bg=self.root['bg'], fg=self.label_fg).pack(side='left')
-            tk.Label(frame, text=record['percentage'], width=8,
-                    font=("Courier", 12), bg=self.root['bg'], fg=self.label_fg).pack(side='left')
-        canvas.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
-        button_frame = tk.Frame(self.root, bg=self.root['bg'])
-        button_frame.pack(pady=10)
+        self.screens.show('history')
+
+    def refresh_history(self):
+        self.update_history_types()
+        self.history_table.refresh()
+        self.update_history_chart()
+
+    def build_history_screen(self, frame):
+        self.themed(tk.Label(frame, text="Test History", font=("Times", 24)), 'label').pack(pady=10)
+        filter_frame = self.themed(tk.Frame(frame), 'frame')
+        filter_frame.pack(fill='x', padx=20)
+        type_var = tk.StringVar(value="All")
+        self.themed(tk.Label(filter_frame, text="Test:", font=("Times", 12)), 'label').pack(side='left')
+        type_menu = tk.OptionMenu(filter_frame, type_var, "All")
+        type_menu.configure(highlightthickness=0)
+        self.themed(type_menu, 'button')
+        type_menu.pack(side='left', padx=5)
+        self.themed(tk.Label(filter_frame, text="From:", font=("Times", 12)), 'label').pack(side='left')
+        from_entry = self.themed(tk.Entry(filter_frame, width=11, font=("Courier", 12)), 'entry')
+        from_entry.pack(side='left', padx=5)
+        self.themed(tk.Label(filter_frame, text="To:", font=("Times", 12)), 'label').pack(side='left')
+        to_entry = self.themed(tk.Entry(filter_frame, width=11, font=("Courier", 12)), 'entry')
+        to_entry.pack(side='left', padx=5)
+        def query(sort_field, descending):
+            test_type = type_var.get()
+            date_from = from_entry.get().strip()
+            date_to = to_entry.get().strip()
+            if test_type == "All" and not date_from and not date_to and sort_field is None:
+                return range(len(self.test_history) - 1, -1, -1)
+            return self.test_history.query(None if test_type == "All" else test_type,
+                                           date_from, date_to, sort_field, descending)
+        table = VirtualTable(frame, self.test_history, HISTORY_COLUMNS, query)
+        self.themed(table.frame, lambda widget, colors: table.set_colors(colors['bg'], colors['label_fg']))
+        self.history_table = table
+        chart = TrendChart(frame)
+        self.themed(chart.canvas, lambda widget, colors: chart.set_colors(colors['bg'], colors['label_fg']))
+        chart.pack(fill='x', padx=20, pady=(10, 0))
+        def update_chart():
+            # Drawn from the stored aggregates, so it only depends on the test type filter
+            test_type = None if type_var.get() == "All" else type_var.get()
+            chart.draw(self.test_history.trend(test_type), self.test_history.stats(test_type))
+        self.update_history_chart = update_chart
+        def update_types():
+            # Listed from the store, so reverse and pack tests can be picked too
+            stored = self.test_history.test_types()
+            built_in = [name for name in ["Complete Test", *PARTS, REVIEW_TEST_TYPE] if name in stored]
+            menu = type_menu['menu']
+            menu.delete(0, 'end')
+            names = ["All"] + built_in + [name for name in stored if name not in built_in]
+            for name in names:
+                menu.add_command(label=name, command=lambda value=name: type_var.set(value))
+            if type_var.get() not in names:
+                type_var.set("All")
+        self.update_history_types = update_types
+        def apply_filter(*args):
+            table.refresh()
+            update_chart()
+        type_var.trace_add('write', apply_filter)
+        from_entry.bind('<Return>', self.profiler.wrap("key", "history filter <Return>", apply_filter))
+        to_entry.bind('<Return>', self.profiler.wrap("key", "history filter <Return>", apply_filter))
+        button_frame = self.themed(tk.Frame(frame), 'frame')
+        button_frame.pack(side='bottom', pady=10)
+        self.create_button(button_frame, text="Filter", command=apply_filter,
+                          width=15, font=("Times", 14)).pack(side='left', padx=10)
         self.create_button(button_frame, text="Back", command=self.create_main_menu,
-                          width=15, font=("Times", 14), bg=self.button_bg, fg=self.button_fg).pack(side='left', padx=10)
+                          width=15, font=("Times", 14)).pack(side='left', padx=10)
         self.create_button(button_frame, text="Clear History", command=self.clear_test_history,
                           width=15, font=("Times", 14), bg="#ff4444", fg="white").pack(side='left', padx=10)
-
-    def clear_window(self):
-        for widget in self.root.winfo_children():
-            if widget != self.persistent_frame:
-                widget.destroy()
+        table.pack(fill='both', expand=True, pady=10)
 
     def load_test_history(self):
-        self.master_volume = tk.DoubleVar(value=1.0)
-        self.click_volume = tk.DoubleVar(value=1.0)
-        self.correct_volume = tk.DoubleVar(value=1.0)
-        self.incorrect_volume = tk.DoubleVar(value=1.0)
-        self.typing_volume = tk.DoubleVar(value=1.0)
+        self.test_history = HistoryStore()
+        self.inline_feedback = tk.BooleanVar(value=True)
+        self.auto_advance = tk.DoubleVar(value=0.0)
+        self.multiple_choice = tk.BooleanVar(value=False)
+        self.reverse_mode = tk.BooleanVar(value=False)
+        self.custom_themes = {}
         
+        self.config_store = ConfigStore(CONFIG_FILE)
         config = {}  # Initialize config
         try:
-            config_data = {}
+            config_data = None
             
             if os.path.exists('app_settings.json'):
                 with open('app_settings.json', 'r') as f:
@@ -417,48 +718,64 @@ class App:
                         'typing_volume': old_data.get('typing_volume', 1.0),
                         'test_history': old_data.get('history', [])
                     }
+                # Written before the old file goes, so the settings are never only in memory
+                self.config_store.save(config_data)
+                self.config_store.flush()
                 os.remove('app_settings.json')
-                with open(CONFIG_FILE, 'w') as new_f:
-                    json.dump(config_data, new_f)
 
-            if os.path.exists(CONFIG_FILE):
-                with open(CONFIG_FILE, 'r') as f:
-                    config = json.load(f)
+            config = self.config_store.load() if config_data is None else config_data
                 
-            if config.get('theme') == 'light':
-                self.apply_light_theme()
-                self.is_dark_theme = False
-            else:
-                self.apply_dark_theme()
-                self.is_dark_theme = True
+            self.custom_themes = config.get('custom_themes', {})
+            self.theme.add_themes(self.custom_themes)
+            self.theme.apply(config.get('theme', 'dark'))
                 
             self.master_volume.set(config.get('master_volume', 1.0))
             self.click_volume.set(config.get('click_volume', 1.0))
             self.correct_volume.set(config.get('correct_volume', 1.0))
             self.incorrect_volume.set(config.get('incorrect_volume', 1.0))
             self.typing_volume.set(config.get('typing_volume', 1.0))
+            self.inline_feedback.set(config.get('inline_feedback', True))
+            self.auto_advance.set(config.get('auto_advance', 0.0))
+            self.multiple_choice.set(config.get('multiple_choice', False))
+            self.reverse_mode.set(config.get('reverse_mode', False))
             
-            self.test_history = config.get('test_history', [])
+            if 'test_history' in config:
+                # History used to live in the config file; move it to the history store once
+                self.test_history.migrate(config['test_history'])
+                self.save_test_history()
 
         except Exception as e:
             print(f"Error loading data: {e}")
-            self.test_history = []
+        self.multiple_choice.trace_add('write', lambda *args: self.save_test_history())
+        self.reverse_mode.trace_add('write', lambda *args: self.save_test_history())
 
     def save_test_history(self):
         config_data = {
-            'theme': 'dark' if self.is_dark_theme else 'light',
+            'theme': self.theme.name,
+            'custom_themes': self.custom_themes,
             'master_volume': self.master_volume.get(),
             'click_volume': self.click_volume.get(),
             'correct_volume': self.correct_volume.get(),
             'incorrect_volume': self.incorrect_volume.get(),
             'typing_volume': self.typing_volume.get(),
-            'test_history': self.test_history
+            'inline_feedback': self.inline_feedback.get(),
+            'auto_advance': self.auto_advance.get(),
+            'multiple_choice': self.multiple_choice.get(),
+            'reverse_mode': self.reverse_mode.get()
         }
-        try:
-            with open(CONFIG_FILE, 'w') as file:
-                json.dump(config_data, file)
-        except Exception as e:
-            print(f"Error saving config: {e}")
+        # Written in the background; rapid changes are coalesced into one write
+        self.config_store.save(config_data)
+
+    def on_close(self):
+        """Finish pending writes before the window goes away"""
+        self.cancel_auto_advance()
+        if self.quiz is not self.local_quiz:
+            self.quiz.close()
+        self.config_store.close()
+        self.test_history.close()
+        self.term_stats.close()
+        self.profiler.close()
+        self.root.destroy()
 
     def show_settings_menu(self):
         self.original_volumes = {
@@ -468,31 +785,39 @@ class App:
             'incorrect': self.incorrect_volume.get(),
             'typing': self.typing_volume.get()
         }
-        self.clear_window()
-        self.create_settings_menu()
-
-    def create_settings_menu(self):
-        self.clear_window()
-        tk.Label(self.root, text="Settings", font=("Times", 24), 
-                bg=self.root['bg'], fg=self.label_fg).pack(pady=10)
-        volume_frame = tk.Frame(self.root, bg=self.root['bg'])
+        self.original_feedback = (self.inline_feedback.get(), self.auto_advance.get())
+        self.screens.show('settings')
+
+    def build_settings_menu(self, frame):
+        self.themed(tk.Label(frame, text="Settings", font=("Times", 24)), 'label').pack(pady=10)
+        volume_frame = self.themed(tk.Frame(frame), 'frame')
         volume_frame.pack(pady=10)
-        tk.Label(volume_frame, text="Master Volume:", bg=self.root['bg'], fg=self.label_fg).grid(row=0, column=0, sticky='w')
-        tk.Scale(volume_frame, from_=0.0, to=1.0, resolution=0.1, orient='horizontal',
-                variable=self.master_volume, bg=self.root['bg'], fg=self.label_fg).grid(row=0, column=1, padx=10)
-        tk.Label(volume_frame, text="Button Clicks:", bg=self.root['bg'], fg=self.label_fg).grid(row=1, column=0, sticky='w')
-        tk.Scale(volume_frame, from_=0.0, to=1.0, resolution=0.1, orient='horizontal',
-                variable=self.click_volume, bg=self.root['bg'], fg=self.label_fg).grid(row=1, column=1, padx=10)
-        tk.Label(volume_frame, text="Correct Sounds:", bg=self.root['bg'], fg=self.label_fg).grid(row=2, column=0, sticky='w')
-        tk.Scale(volume_frame, from_=0.0, to=1.0, resolution=0.1, orient='horizontal',
-                variable=self.correct_volume, bg=self.root['bg'], fg=self.label_fg).grid(row=2, column=1, padx=10)
-        tk.Label(volume_frame, text="Incorrect Sounds:", bg=self.root['bg'], fg=self.label_fg).grid(row=3, column=0, sticky='w')
-        tk.Scale(volume_frame, from_=0.0, to=1.0, resolution=0.1, orient='horizontal',
-                variable=self.incorrect_volume, bg=self.root['bg'], fg=self.label_fg).grid(row=3, column=1, padx=10)
-        tk.Label(volume_frame, text="Typing Sounds:", bg=self.root['bg'], fg=self.label_fg).grid(row=4, column=0, sticky='w')
-        tk.Scale(volume_frame, from_=0.0, to=1.0, resolution=0.1, orient='horizontal',
-                variable=self.typing_volume, bg=self.root['bg'], fg=self.label_fg).grid(row=4, column=1, padx=10)
-        button_frame = tk.Frame(self.root, bg=self.root['bg'])
+        self.themed(tk.Label(volume_frame, text="Master Volume:"), 'label').grid(row=0, column=0, sticky='w')
+        self.themed(tk.Scale(volume_frame, from_=0.0, to=1.0, resolution=0.1, orient='horizontal',
+                variable=self.master_volume), 'scale').grid(row=0, column=1, padx=10)
+        self.themed(tk.Label(volume_frame, text="Button Clicks:"), 'label').grid(row=1, column=0, sticky='w')
+        self.themed(tk.Scale(volume_frame, from_=0.0, to=1.0, resolution=0.1, orient='horizontal',
+                variable=self.click_volume), 'scale').grid(row=1, column=1, padx=10)
+        self.themed(tk.Label(volume_frame, text="Correct Sounds:"), 'label').grid(row=2, column=0, sticky='w')
+        self.themed(tk.Scale(volume_frame, from_=0.0, to=1.0, resolution=0.1, orient='horizontal',
+                variable=self.correct_volume), 'scale').grid(row=2, column=1, padx=10)
+        self.themed(tk.Label(volume_frame, text="Incorrect Sounds:"), 'label').grid(row=3, column=0, sticky='w')
+        self.themed(tk.Scale(volume_frame, from_=0.0, to=1.0, resolution=0.1, orient='horizontal',
+                variable=self.incorrect_volume), 'scale').grid(row=3, column=1, padx=10)
+        self.themed(tk.Label(volume_frame, text="Typing Sounds:"), 'label').grid(row=4, column=0, sticky='w')
+        self.themed(tk.Scale(volume_frame, from_=0.0, to=1.0, resolution=0.1, orient='horizontal',
+                variable=self.typing_volume), 'scale').grid(row=4, column=1, padx=10)
+        self.themed(tk.Checkbutton(volume_frame, text="Show answer feedback inline",
+                variable=self.inline_feedback), 'check').grid(row=5, column=0, columnspan=2, sticky='w')
+        self.themed(tk.Label(volume_frame, text="Auto-advance (s):"), 'label').grid(row=6, column=0, sticky='w')
+        self.themed(tk.Scale(volume_frame, from_=0.0, to=5.0, resolution=0.5, orient='horizontal',
+                variable=self.auto_advance), 'scale').grid(row=6, column=1, padx=10)
+        self.themed(tk.Label(volume_frame, text="Theme:"), 'label').grid(row=7, column=0, sticky='w')
+        self.theme_choice = tk.StringVar(value=self.theme.name)
+        theme_menu = tk.OptionMenu(volume_frame, self.theme_choice, *self.theme.themes, command=self.select_theme)
+        theme_menu.configure(highlightthickness=0)
+        self.themed(theme_menu, 'button').grid(row=7, column=1, padx=10, sticky='ew')
+        button_frame = self.themed(tk.Frame(frame), 'frame')
         button_frame.pack(pady=20)
         self.create_button(button_frame, text="Save", command=self.save_settings,
                           width=15, font=("Times", 14), bg="#4CAF50", fg="white").pack(side='left', padx=10)
@@ -509,16 +834,29 @@ class App:
         self.correct_volume.set(self.original_volumes['correct'])
         self.incorrect_volume.set(self.original_volumes['incorrect'])
         self.typing_volume.set(self.original_volumes['typing'])
+        self.inline_feedback.set(self.original_feedback[0])
+        self.auto_advance.set(self.original_feedback[1])
         self.create_main_menu()
 
     def clear_test_history(self):
         if messagebox.askyesno("Confirm Clear", "Delete ALL test history?\nThis cannot be undone!"):
-            self.test_history = []
-            self.save_test_history()
+            self.test_history.clear()
+            if messagebox.askyesno("Clear Term Statistics", "Also reset the review statistics for every term?"):
+                self.term_stats.clear()
+                self.scheduler = ReviewScheduler(self.data["dictionary"], {}, store=self.term_stats)
+                self.local_quiz.on_answer = self.scheduler.record
             messagebox.showinfo("Cleared", "All test history has been deleted")
-            self.view_test_history()
+            self.refresh_history()
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Grade 5 Musical Terms")
+    parser.add_argument("--server", metavar="URL",
+                        help="run tests on a classroom server, e.g. http://192.168.0.10:8765")
+    parser.add_argument("--profile", nargs='?', const=TRACE_FILE, metavar="TRACE_FILE",
+                        help=f"time handlers into a JSONL trace (default {TRACE_FILE}); F12 shows live latencies")
+    args = parser.parse_args()
+    trace_path = profile_target(args.profile)
+    profiler = Profiler(trace_path) if trace_path else None
     root = tk.Tk()
-    app = App(root)
+    app = App(root, server_url=args.server, profiler=profiler)
     root.mainloop()
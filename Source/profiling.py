@@ -0,0 +1,199 @@
+"""Opt-in timing of startup phases, button commands, navigation and key handlers
+
+Enable it with `python main.py --profile [TRACE_FILE]` or by setting
+G5MT_PROFILE to 1 (default trace file) or to a trace file path. Every timed
+call is appended to the trace as one JSON line; closing the app adds one
+summary line per handler with its count, p50, p99, max and histogram.
+Press F12 in the app to show or hide live p50/p99 latencies.
+"""
+import bisect
+import json
+import os
+import queue
+import threading
+import time
+import tkinter as tk
+from contextlib import contextmanager
+
+PROFILE_ENV = "G5MT_PROFILE"
+TRACE_FILE = "resource/profile.jsonl"
+# Bucket upper bounds in ms, 25% apart from 0.05 ms to about a minute
+BUCKET_BOUNDS = [0.05 * 1.25 ** i for i in range(64)]
+OVERLAY_REFRESH_MS = 500
+OVERLAY_ROWS = 5
+
+
+def profile_target(argument=None):
+    """Return the trace path to profile into, from the --profile argument or the environment, or None"""
+    if argument:
+        return argument
+    value = os.environ.get(PROFILE_ENV, "")
+    if value.lower() in ("", "0", "false", "no"):
+        return None
+    return TRACE_FILE if value.lower() in ("1", "true", "yes") else value
+
+
+class Histogram:
+    """Log-bucketed latency histogram; percentiles are accurate to one bucket (25%)"""
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKET_BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, ms):
+        self.counts[bisect.bisect_left(BUCKET_BOUNDS, ms)] += 1
+        self.count += 1
+        self.total += ms
+        self.max = max(self.max, ms)
+
+    def percentile(self, fraction):
+        if not self.count:
+            return 0.0
+        rank = fraction * self.count
+        seen = 0
+        for bucket, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min(BUCKET_BOUNDS[bucket] if bucket < len(BUCKET_BOUNDS) else self.max, self.max)
+        return self.max
+
+    def summary(self):
+        return {
+            'count': self.count,
+            'mean_ms': round(self.total / self.count, 3) if self.count else 0.0,
+            'p50_ms': round(self.percentile(0.5), 3),
+            'p99_ms': round(self.percentile(0.99), 3),
+            'max_ms': round(self.max, 3),
+            'buckets': {f"{BUCKET_BOUNDS[i]:.3g}" if i < len(BUCKET_BOUNDS) else "inf": count
+                        for i, count in enumerate(self.counts) if count}
+        }
+
+
+class Profiler:
+    """Times calls into per-handler histograms and a JSONL trace
+
+    A disabled profiler hands back the functions it is asked to wrap, so the
+    instrumentation costs nothing unless profiling was asked for. Trace lines
+    are written by a background thread.
+    """
+
+    def __init__(self, trace_path=None, enabled=True):
+        self.enabled = enabled
+        self.trace_path = trace_path
+        self.histograms = {}
+        # Outermost handler calls only, so a command that navigates is counted once
+        self.handlers = Histogram()
+        self.depth = 0
+        self.origin = time.perf_counter()
+        self.lines = queue.SimpleQueue()
+        self.writer = None
+        if enabled and trace_path:
+            self.writer = threading.Thread(target=self._write_trace, name="profile-trace", daemon=True)
+            self.writer.start()
+
+    def record(self, kind, name, start, end, outermost=True):
+        ms = (end - start) * 1000
+        key = f"{kind}:{name}"
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = self.histograms[key] = Histogram()
+        histogram.add(ms)
+        if outermost and kind != "startup":
+            self.handlers.add(ms)
+        if self.writer is not None:
+            self.lines.put({'t': round(start - self.origin, 6), 'kind': kind, 'name': name, 'ms': round(ms, 3)})
+
+    @contextmanager
+    def measure(self, kind, name):
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        self.depth += 1
+        try:
+            yield
+        finally:
+            self.depth -= 1
+            self.record(kind, name, start, time.perf_counter(), self.depth == 0)
+
+    def wrap(self, kind, name, func):
+        if not self.enabled:
+            return func
+
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            self.depth += 1
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.depth -= 1
+                self.record(kind, name, start, time.perf_counter(), self.depth == 0)
+        return timed
+
+    def slowest(self, count=OVERLAY_ROWS):
+        """Return the (key, histogram) pairs with the highest p99, excluding startup phases"""
+        entries = [(key, histogram) for key, histogram in self.histograms.items() if not key.startswith("startup:")]
+        entries.sort(key=lambda entry: entry[1].percentile(0.99), reverse=True)
+        return entries[:count]
+
+    def summary(self):
+        return {key: histogram.summary() for key, histogram in sorted(self.histograms.items())}
+
+    def _write_trace(self):
+        with open(self.trace_path, 'a', encoding='utf-8') as file:
+            while True:
+                line = self.lines.get()
+                while True:
+                    if line is None:
+                        return
+                    file.write(json.dumps(line) + "\n")
+                    try:
+                        line = self.lines.get_nowait()
+                    except queue.Empty:
+                        break
+                file.flush()
+
+    def close(self):
+        """Write one summary line per handler and finish the trace file"""
+        if self.writer is None:
+            return
+        for key, summary in self.summary().items():
+            self.lines.put({'summary': key, **summary})
+        self.lines.put(None)
+        self.writer.join(5.0)
+        self.writer = None
+
+
+class ProfilerOverlay:
+    """Corner label with live handler latencies, hidden until toggled"""
+
+    def __init__(self, root, profiler):
+        self.root = root
+        self.profiler = profiler
+        self.label = tk.Label(root, justify='left', anchor='nw', font=("Courier", 10), bg="black", fg="#00ff00")
+        self.visible = False
+        self.job = None
+
+    def toggle(self, event=None):
+        self.visible = not self.visible
+        if self.visible:
+            self.label.place(relx=1.0, y=0, anchor='ne')
+            self.label.lift()
+            self.refresh()
+        else:
+            self.label.place_forget()
+            if self.job is not None:
+                self.root.after_cancel(self.job)
+                self.job = None
+
+    def refresh(self):
+        handlers = self.profiler.handlers
+        lines = [f"all handlers  n={handlers.count}  p50={handlers.percentile(0.5):.1f}ms  "
+                 f"p99={handlers.percentile(0.99):.1f}ms"]
+        for key, histogram in self.profiler.slowest():
+            lines.append(f"{key[:28]:<28} p50={histogram.percentile(0.5):6.1f} p99={histogram.percentile(0.99):6.1f}")
+        self.label.configure(text="\n".join(lines))
+        self.label.lift()
+        self.job = self.root.after(OVERLAY_REFRESH_MS, self.refresh)
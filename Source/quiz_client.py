@@ -0,0 +1,111 @@
+import http.client
+import json
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from quiz_engine import AnswerResult
+
+# A classroom server answers in milliseconds; anything slower is treated as down
+REQUEST_TIMEOUT = 3
+
+
+class RemoteQuizEngine:
+    """Runs sessions on a classroom server (see server.py) with the QuizEngine interface"""
+
+    def __init__(self, url):
+        parts = urlsplit(url)
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.connection = None
+        # One worker, so requests keep their order and the connection is only used by one thread
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="quiz-client")
+
+    def request(self, method, path, payload=None):
+        """Send a JSON request over a kept-alive connection, reconnecting once if it dropped
+
+        Every failure is raised as an OSError, including replies that are not
+        HTTP or not JSON, so callers have one error to handle.
+        """
+        body = json.dumps(payload) if payload is not None else None
+        headers = {'Content-Type': "application/json"}
+        for attempt in range(2):
+            if self.connection is None:
+                self.connection = http.client.HTTPConnection(self.host, self.port, timeout=REQUEST_TIMEOUT)
+            try:
+                self.connection.request(method, path, body=body, headers=headers)
+                response = self.connection.getresponse()
+                data = json.loads(response.read() or b"{}")
+            except (http.client.HTTPException, ConnectionError, ValueError) as e:
+                self.connection.close()
+                self.connection = None
+                if not attempt:
+                    continue
+                if isinstance(e, OSError):
+                    raise
+                raise OSError(f"Bad reply from {self.host}:{self.port}: {e!r}") from e
+            if response.status >= 400:
+                raise OSError(f"Server error {response.status}: {data.get('error')}")
+            return data
+
+    def start(self, category, test_type=None, multiple_choice=False, reverse=False):
+        # Waits, but behind any answer still in flight from an abandoned session
+        data = self.executor.submit(self.request, "POST", "/sessions", {
+            'category': category, 'test_type': test_type, 'multiple_choice': multiple_choice, 'reverse': reverse
+        }).result()
+        return RemoteSession(self, data)
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+class RemoteSession:
+    """Client side of a server-hosted Session; each answer is one round trip"""
+
+    def __init__(self, engine, data):
+        self.engine = engine
+        self.session_id = data['session']
+        self.total = data['total']
+        self.reverse = data.get('reverse', False)
+        self.correct = 0
+        self.number = 0
+        self.current = None
+        self.choices = None
+        self._next_question = data['question']
+        self._record = None
+
+    @property
+    def finished(self):
+        return self._next_question is None
+
+    def next(self):
+        question = self._next_question
+        if question is None:
+            self.current = None
+            return None
+        self.number = question['number']
+        # Answers stay on the server; only the prompt is needed to ask the question
+        self.current = (question['term'], None)
+        self.choices = question.get('choices')
+        return self.current
+
+    def answer(self, user_answer):
+        data = self.engine.request("POST", f"/sessions/{self.session_id}/answer", {'answer': user_answer})
+        self.correct = data['score']
+        self._next_question = data['question']
+        self._record = data.get('record')
+        return AnswerResult(data['correct'], data['expected'])
+
+    def abandon(self):
+        """Drop an unfinished session on the server; sent in the background and failures are ignored"""
+        if self._next_question is None:
+            return
+        self._next_question = None
+        self.engine.executor.submit(self.engine.request, "DELETE", f"/sessions/{self.session_id}")
+
+    def answer_async(self, user_answer):
+        """Send the answer on the engine's worker thread; returns a Future of the AnswerResult"""
+        return self.engine.executor.submit(self.answer, user_answer)
+
+    def record(self, date=None):
+        """The record the server wrote to its own history when the session finished"""
+        return self._record
@@ -0,0 +1,212 @@
+"""Headless quiz logic shared by the Tk app, the command line and benchmarks
+
+Nothing here imports tkinter or pygame. Run from the Source directory:
+    python quiz_engine.py --category tempo        # take a test in the terminal
+    python quiz_engine.py --category tempo --choices   # multiple choice
+    python quiz_engine.py --category tempo --reverse   # name the term for a meaning
+    python quiz_engine.py --simulate 10000        # time simulated sessions
+"""
+import argparse
+import random
+import time
+from collections import namedtuple
+from datetime import datetime
+from functools import partial
+
+from distractors import CHOICES, DistractorIndex
+from grading import AnswerGrader
+from resource_bundle import load_bundle
+from reverse_index import ReverseIndex
+
+DATE_FORMAT = "%Y-%m-%d %H:%M"
+PARTS = {
+    "Tempo": "tempo",
+    "Expression": "expression",
+    "Dynamics": "dynamics",
+    "General": "general",
+    "Articulation": "articulation",
+    "Signs": "signs"
+}
+TEST_TYPES = {"Complete Test": "dictionary", **PARTS}
+REVERSE_SUFFIX = " (Reverse)"
+
+AnswerResult = namedtuple('AnswerResult', ['correct', 'expected'])
+
+
+class Session:
+    """One run through a shuffled set of (term, meaning) questions
+
+    A reverse session asks (meaning, terms) questions instead: the prompt is a
+    meaning and the expected answer is any of the terms that have it.
+    """
+
+    def __init__(self, questions, test_type, grade, rng=random, on_answer=None, make_choices=None,
+                 reverse=False):
+        self.questions = list(questions)
+        rng.shuffle(self.questions)
+        self.test_type = test_type
+        self.grade = grade
+        self.reverse = reverse
+        self.on_answer = on_answer
+        # For multiple choice, make_choices(term, meaning, rng=rng) returns the options to offer
+        self.make_choices = make_choices
+        self.rng = rng
+        self.choices = None
+        self.total = len(self.questions)
+        self.correct = 0
+        self.number = 0
+        self.current = None
+        self.answers = []
+
+    @property
+    def finished(self):
+        return not self.questions
+
+    def next(self):
+        """Advance to the next question and return it, or None when the test is over"""
+        if not self.questions:
+            self.current = None
+            return None
+        self.number += 1
+        self.current = self.questions.pop()
+        if self.make_choices is not None:
+            self.choices = self.make_choices(*self.current, rng=self.rng)
+        return self.current
+
+    def answer(self, user_answer):
+        key, correct_answer = self.current
+        correct = self.grade(user_answer, correct_answer)
+        self.answers.append([key, correct_answer, user_answer])
+        if self.on_answer is not None:
+            self.on_answer(key, correct_answer, correct)
+        if correct:
+            self.correct += 1
+        return AnswerResult(correct, correct_answer)
+
+    def record(self, date=None):
+        """Return the history record for this session, including every answer given"""
+        date = date or datetime.now()
+        percentage = (self.correct / self.total) * 100 if self.total else 0.0
+        return {
+            'date': date.strftime(DATE_FORMAT),
+            'test_type': self.test_type,
+            'score': f"{self.correct}/{self.total}",
+            'percentage': f"{percentage:.1f}%",
+            'answers': self.answers
+        }
+
+
+class QuizEngine:
+    """Starts sessions over the loaded term sets
+
+    Every meaning's accepted answer forms are computed here, once, so grading
+    during a session is a lookup plus a bounded edit distance.
+    """
+
+    def __init__(self, data, grader=None, on_answer=None):
+        self.data = data
+        if grader is None:
+            grader = AnswerGrader(meaning for terms in data.values() for meaning in terms.values())
+        self.grader = grader
+        # Called as on_answer(term, meaning, correct) after every graded answer
+        self.on_answer = on_answer
+        self._distractors = None
+        self._reverse_index = None
+
+    @property
+    def distractors(self):
+        """The multiple-choice neighbour table, loaded on first use"""
+        if self._distractors is None:
+            self._distractors = DistractorIndex(self.data, grader=self.grader)
+        return self._distractors
+
+    @property
+    def reverse_index(self):
+        """The meaning -> terms index for reverse questions, built on first use"""
+        if self._reverse_index is None:
+            self._reverse_index = ReverseIndex(self.data["dictionary"])
+        return self._reverse_index
+
+    def reverse_choices(self, meaning, answer, rng=random):
+        """Offer one of the meaning's terms among terms whose meanings are similar"""
+        term = rng.choice(self.reverse_index.terms_for(meaning))
+        pool = [other for other in self.distractors.neighbours.get(term, ())
+                if not self.reverse_index.grade(other, answer)]
+        options = [term] + rng.sample(pool, min(CHOICES - 1, len(pool)))
+        rng.shuffle(options)
+        return options
+
+    def start(self, category, test_type=None, rng=random, multiple_choice=False, reverse=False):
+        if test_type is None:
+            test_type = next((name for name, key in TEST_TYPES.items() if key == category), category)
+        if reverse:
+            # Term statistics are kept for forward answers only
+            return Session(self.reverse_index.questions(self.data[category]), test_type + REVERSE_SUFFIX,
+                           self.reverse_index.grade, rng=rng, reverse=True,
+                           make_choices=self.reverse_choices if multiple_choice else None)
+        make_choices = partial(self.distractors.choices, category=category) if multiple_choice else None
+        return Session(self.data[category].items(), test_type, self.grader.grade, rng=rng,
+                       on_answer=self.on_answer, make_choices=make_choices)
+
+
+def question_text(session, key):
+    return f"Which term means '{key}'?" if session.reverse else f"What is the meaning of '{key}'?"
+
+
+def run_interactive(engine, category, multiple_choice=False, reverse=False):
+    session = engine.start(category, multiple_choice=multiple_choice, reverse=reverse)
+    while session.next() is not None:
+        key, value = session.current
+        prompt = f"[{session.number}/{session.total}] {question_text(session, key)} "
+        if session.choices:
+            for number, choice in enumerate(session.choices, 1):
+                prompt += f"\n  {number}. {choice}"
+            prompt += "\nChoice: "
+        try:
+            user_answer = input(prompt)
+        except EOFError:
+            print()
+            break
+        if session.choices and user_answer.strip().isdigit() and 0 < int(user_answer) <= len(session.choices):
+            user_answer = session.choices[int(user_answer) - 1]
+        result = session.answer(user_answer)
+        print("Correct!" if result.correct else f"Incorrect. The correct answer is: {result.expected}")
+    print(f"Score: {session.correct}/{session.total}")
+
+
+def simulate(engine, category, sessions, accuracy, seed=0):
+    """Run sessions with simulated answers; returns (records, seconds)"""
+    rng = random.Random(seed)
+    records = []
+    start = time.perf_counter()
+    for _ in range(sessions):
+        session = engine.start(category, rng=rng)
+        while session.next() is not None:
+            key, value = session.current
+            session.answer(value if rng.random() < accuracy else "")
+        records.append(session.record())
+    return records, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Grade 5 musical terms quiz without a GUI")
+    parser.add_argument("--category", default="dictionary", choices=sorted(TEST_TYPES.values()))
+    parser.add_argument("--choices", action="store_true", help="offer multiple-choice answers")
+    parser.add_argument("--reverse", action="store_true", help="ask for the term given its meaning")
+    parser.add_argument("--simulate", type=int, metavar="SESSIONS",
+                        help="run simulated sessions and report throughput instead of quizzing")
+    parser.add_argument("--accuracy", type=float, default=0.7,
+                        help="chance a simulated answer is correct")
+    args = parser.parse_args()
+    engine = QuizEngine(load_bundle())
+    if args.simulate:
+        records, seconds = simulate(engine, args.category, args.simulate, args.accuracy)
+        questions = sum(int(record['score'].split('/')[1]) for record in records)
+        print(f"{len(records)} sessions ({questions} answers) in {seconds:.3f} s: "
+              f"{len(records) / seconds:.0f} sessions/s")
+    else:
+        run_interactive(engine, args.category, args.choices, args.reverse)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+import hashlib
+import json
+import os
+import sys
+
+BUNDLE_FILE = "resource/terms.bundle.json"
+BUNDLE_VERSION = 1
+TERM_FILES = {
+    "dictionary": "resource/dictionary.json",
+    "tempo": "resource/tempo.json",
+    "expression": "resource/expression.json",
+    "dynamics": "resource/dynamics.json",
+    "general": "resource/general.json",
+    "articulation": "resource/articulation.json",
+    "signs": "resource/signs.json"
+}
+
+
+def file_signature(path):
+    stat = os.stat(path)
+    return {'path': path, 'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size}
+
+
+def file_hash(path):
+    with open(path, 'rb') as file:
+        return hashlib.sha1(file.read()).hexdigest()
+
+
+def compile_bundle(sources):
+    """Compile term set files into one canonical term table with per-category ids
+
+    A term that appears in several files (every category is a subset of the
+    dictionary) is stored once and referenced by index from each category.
+    """
+    terms = []
+    term_ids = {}
+    categories = {}
+    signatures = {}
+    for name, path in sources.items():
+        with open(path, 'rb') as file:
+            raw = file.read()
+        signature = file_signature(path)
+        signature['sha1'] = hashlib.sha1(raw).hexdigest()
+        signatures[name] = signature
+        ids = []
+        for key, value in json.loads(raw.decode('utf-8')).items():
+            term_id = term_ids.get((key, value))
+            if term_id is None:
+                term_id = term_ids[(key, value)] = len(terms)
+                terms.append([key, value])
+            ids.append(term_id)
+        categories[name] = ids
+    return {
+        'version': BUNDLE_VERSION,
+        'sources': signatures,
+        'terms': terms,
+        'categories': categories
+    }
+
+
+def bundle_is_current(bundle, sources):
+    """Check a cached bundle against its sources by mtime and size, then by hash
+
+    Returns True, False, or "touched" when only metadata changed and the cached
+    signatures should be refreshed.
+    """
+    if bundle.get('version') != BUNDLE_VERSION or set(bundle.get('sources', {})) != set(sources):
+        return False
+    touched = False
+    for name, path in sources.items():
+        cached = bundle['sources'][name]
+        if cached['path'] != path:
+            return False
+        current = file_signature(path)
+        if current['mtime_ns'] == cached['mtime_ns'] and current['size'] == cached['size']:
+            continue
+        if current['size'] != cached['size'] or file_hash(path) != cached['sha1']:
+            return False
+        cached.update(current)
+        touched = True
+    return "touched" if touched else True
+
+
+def write_bundle(bundle, bundle_path=BUNDLE_FILE):
+    temp_path = f"{bundle_path}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as file:
+        json.dump(bundle, file, ensure_ascii=False, separators=(',', ':'))
+    os.replace(temp_path, bundle_path)
+
+
+def expand_bundle(bundle):
+    """Return {category: {term: meaning}} dicts that share the bundle's strings
+
+    Strings are interned, so term packs that repeat a term or meaning share it.
+    """
+    terms = [(sys.intern(term), sys.intern(meaning)) for term, meaning in bundle['terms']]
+    return {
+        name: dict(terms[term_id] for term_id in ids)
+        for name, ids in bundle['categories'].items()
+    }
+
+
+def load_bundle(sources=TERM_FILES, bundle_path=BUNDLE_FILE):
+    """Load all term sets from the cached bundle, recompiling it when a source changed"""
+    bundle = None
+    try:
+        with open(bundle_path, 'r', encoding='utf-8') as file:
+            bundle = json.load(file)
+        status = bundle_is_current(bundle, sources)
+    except (OSError, ValueError, KeyError, TypeError):
+        status = False
+    if not status:
+        bundle = compile_bundle(sources)
+    if status is not True:
+        try:
+            write_bundle(bundle, bundle_path)
+        except OSError as e:
+            print(f"Error writing resource bundle: {e}")
+    return expand_bundle(bundle)
@@ -0,0 +1,97 @@
+"""Reverse questions: given a meaning, name the term
+
+Terms are indexed by their normalized meaning, so the terms sharing a meaning
+("slow" is adagio, lento, lent and langsam) are found with one lookup and all
+of them are accepted. Every term also accepts its aliases: "accelerando
+(accel.)" accepts "accel.", "comodo/tempo comodo" accepts "tempo comodo".
+"""
+import re
+import unicodedata
+
+from grading import PARENTHESES, TOKEN_PATTERN, normalize, typo_patterns, within_typos
+
+LANGUAGE_TAGS = frozenset(["french", "german", "italian"])
+ALIAS_SEPARATORS = re.compile(r"[,/]")
+ANSWER_SEPARATOR = " / "
+
+
+def normalize_term(text):
+    """Lowercase, drop accents, punctuation and language tags such as "(French)" """
+    text = unicodedata.normalize('NFKD', text.lower().replace("’", "'"))
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    tokens = TOKEN_PATTERN.findall(text)
+    content = [token for token in tokens if token not in LANGUAGE_TAGS]
+    return " ".join(content or tokens)
+
+
+def term_aliases(term):
+    """Return every normalized form a term may be answered with"""
+    phrases = [term, PARENTHESES.sub(" ", term)] + PARENTHESES.findall(term)
+    forms = set()
+    for phrase in phrases:
+        for part in [phrase] + ALIAS_SEPARATORS.split(phrase):
+            form = normalize_term(part)
+            if form and form not in LANGUAGE_TAGS:
+                forms.add(form)
+    return forms
+
+
+class ReverseIndex:
+    """Inverted index from normalized meanings to the terms that have them"""
+
+    def __init__(self, dictionary):
+        self.meaning_keys = {}
+        self.terms_by_meaning = {}
+        for term, meaning in dictionary.items():
+            key = self.meaning_keys.get(meaning)
+            if key is None:
+                key = self.meaning_keys[meaning] = normalize(meaning)
+            self.terms_by_meaning.setdefault(key, []).append(term)
+        # The expected answer shown to the user doubles as the key for grading
+        self.answers = {}
+        self.entries = {}
+        # Naming another term exactly is a wrong answer, never a typo
+        self.known_forms = set()
+        for key, terms in self.terms_by_meaning.items():
+            answer = ANSWER_SEPARATOR.join(terms)
+            self.answers[key] = answer
+            forms = set()
+            for term in terms:
+                forms |= term_aliases(term)
+            self.entries[answer] = (forms, [typo_patterns(form) for form in forms])
+            self.known_forms |= forms
+
+    def key(self, meaning):
+        key = self.meaning_keys.get(meaning)
+        return normalize(meaning) if key is None else key
+
+    def terms_for(self, meaning):
+        return self.terms_by_meaning.get(self.key(meaning), [])
+
+    def is_ambiguous(self, meaning):
+        """True when several terms share this meaning"""
+        return len(self.terms_for(meaning)) > 1
+
+    def questions(self, terms):
+        """Return (meaning, answer) pairs for a term set, one per distinct meaning"""
+        questions = {}
+        for term, meaning in terms.items():
+            key = self.key(meaning)
+            if key not in questions and key in self.answers:
+                questions[key] = (meaning, self.answers[key])
+        return list(questions.values())
+
+    def grade(self, user_answer, answer):
+        entry = self.entries.get(answer)
+        if entry is None:
+            return user_answer.strip().lower() == answer.lower()
+        given = normalize_term(user_answer)
+        if not given:
+            return False
+        forms, patterns = entry
+        if given in forms:
+            return True
+        if given in self.known_forms:
+            return False
+        words = given.split()
+        return any(within_typos(limit, word_patterns, words) for limit, word_patterns in patterns)
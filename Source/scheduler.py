@@ -0,0 +1,121 @@
+import heapq
+import time
+
+from quiz_engine import Session
+
+REVIEW_TEST_TYPE = "Review"
+REVIEW_LENGTH = 20
+# Seconds until a term is due again, indexed by its current run of correct answers
+REVIEW_INTERVALS = [60, 10 * 60, 60 * 60, 24 * 60 * 60, 3 * 24 * 60 * 60, 7 * 24 * 60 * 60, 21 * 24 * 60 * 60]
+
+
+class ReviewScheduler:
+    """Spaced-repetition order over terms, with O(log n) picks and updates
+
+    Terms wait in an `upcoming` heap ordered by due time. When picking, every
+    term that has come due moves to a `ready` heap ordered by weakness
+    (smoothed accuracy), and the weakest ready term is asked next. With
+    nothing due, the term due soonest is asked. Updated terms are pushed
+    again with a new version number; stale heap entries are skipped.
+    """
+
+    def __init__(self, terms, stats, store=None):
+        self.meanings = dict(terms)
+        self.stats = dict(stats)
+        self.store = store
+        self.versions = {}
+        self.upcoming = []
+        self.ready = []
+        for term in self.meanings:
+            self.versions[term] = 0
+            self.upcoming.append((self._due(term), term, 0))
+        heapq.heapify(self.upcoming)
+
+    def _due(self, term):
+        stats = self.stats.get(term)
+        return stats[3] if stats else 0.0
+
+    def _weakness(self, term):
+        attempts, correct = self.stats.get(term, (0, 0))[:2]
+        return ((correct + 1) / (attempts + 2), attempts)
+
+    def _promote(self, now):
+        while self.upcoming and self.upcoming[0][0] <= now:
+            due, term, version = heapq.heappop(self.upcoming)
+            if version == self.versions[term]:
+                heapq.heappush(self.ready, (self._weakness(term), term, version))
+
+    def pop(self, exclude=(), now=None):
+        """Return the next term to ask, skipping terms in exclude"""
+        self._promote(time.time() if now is None else now)
+        skipped = []
+        found = None
+        for heap in (self.ready, self.upcoming):
+            while heap:
+                entry = heapq.heappop(heap)
+                term, version = entry[1], entry[2]
+                if version != self.versions[term]:
+                    continue
+                if term in exclude:
+                    skipped.append((heap, entry))
+                    continue
+                found = term
+                break
+            if found is not None:
+                break
+        for heap, entry in skipped:
+            heapq.heappush(heap, entry)
+        if found is not None:
+            # Keep the term scheduled in case it is never answered; record() supersedes this entry
+            heapq.heappush(self.upcoming, (self._due(found), found, self.versions[found]))
+        return found
+
+    def record(self, term, meaning, correct, now=None):
+        """Update a term's statistics, persist them and reschedule the term
+
+        Terms outside the scheduler's term set, such as pack terms, are ignored:
+        review covers the set it was built over, across restarts alike.
+        """
+        if term not in self.versions:
+            return
+        now = time.time() if now is None else now
+        attempts, right, streak = self.stats.get(term, (0, 0, 0))[:3]
+        attempts += 1
+        if correct:
+            right += 1
+            streak += 1
+        else:
+            streak = 0
+        interval = REVIEW_INTERVALS[min(streak, len(REVIEW_INTERVALS) - 1)]
+        self.stats[term] = (attempts, right, streak, now + interval, now)
+        self.versions[term] += 1
+        heapq.heappush(self.upcoming, (now + interval, term, self.versions[term]))
+        if self.store is not None:
+            self.store.save(term, self.stats[term])
+
+
+class ReviewSession(Session):
+    """A session whose questions come from the scheduler one at a time"""
+
+    def __init__(self, scheduler, grade, length=REVIEW_LENGTH):
+        super().__init__((), REVIEW_TEST_TYPE, grade, on_answer=scheduler.record)
+        self.scheduler = scheduler
+        self.total = min(length, len(scheduler.meanings))
+        self.asked = set()
+
+    @property
+    def finished(self):
+        return self.number >= self.total
+
+    def next(self):
+        if self.current is not None:
+            term, meaning = self.current
+            self.asked.add(term)
+        term = self.scheduler.pop(exclude=self.asked) if self.number < self.total else None
+        if term is None:
+            self.total = self.number
+            self.current = None
+            return None
+        self.number += 1
+        self.current = (term, self.scheduler.meanings[term])
+        return self.current
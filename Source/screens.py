@@ -0,0 +1,57 @@
+import tkinter as tk
+
+from profiling import Profiler
+
+
+class ScreenManager:
+    """Builds each screen's frame once and switches screens by packing frames
+
+    A screen is registered with a builder that fills its frame, and optional
+    on_show/on_hide callbacks that refresh dynamic content in place. Frames
+    are registered with the theme manager, so cached screens follow theme
+    changes while hidden. Each show() is timed by the profiler as navigation.
+    """
+
+    def __init__(self, root, theme, profiler=None):
+        self.root = root
+        self.theme = theme
+        self.profiler = profiler or Profiler(enabled=False)
+        self.screens = {}
+        self.frames = {}
+        self.current = None
+
+    def register(self, name, builder, on_show=None, on_hide=None):
+        self.screens[name] = (builder, on_show, on_hide)
+
+    def frame(self, name):
+        """Return the screen's frame, building it on first use"""
+        if name not in self.frames:
+            builder, on_show, on_hide = self.screens[name]
+            frame = self.theme.register(tk.Frame(self.root), 'frame')
+            self.frames[name] = frame
+            builder(frame)
+        return self.frames[name]
+
+    def show(self, name, *args):
+        with self.profiler.measure("navigation", name):
+            self._show(name, *args)
+
+    def _show(self, name, *args):
+        frame = self.frame(name)
+        if self.current != name:
+            if self.current is not None:
+                on_hide = self.screens[self.current][2]
+                if on_hide is not None:
+                    on_hide()
+                self.frames[self.current].pack_forget()
+            frame.pack(expand=True, fill='both')
+            self.current = name
+        on_show = self.screens[name][1]
+        if on_show is not None:
+            on_show(*args)
+
+    def discard_hidden(self):
+        """Destroy every cached screen except the visible one, so it is rebuilt on next use"""
+        for name in list(self.frames):
+            if name != self.current:
+                self.frames.pop(name).destroy()
@@ -0,0 +1,86 @@
+from array import array
+
+GRAM_SIZE = 3
+
+
+class SearchIndex:
+    """Trigram index over dictionary terms and meanings for substring search"""
+
+    def __init__(self, dictionary):
+        self.entries = []
+        self.max_key_length = 0
+        self._haystacks = []
+        self._postings = {}
+        self.add(dictionary.items())
+
+    def add(self, entries):
+        """Index more (term, meaning) pairs; their ids follow the existing ones"""
+        postings = self._postings
+        for key, value in entries:
+            entry_id = len(self.entries)
+            self.entries.append((key, value))
+            if len(key) > self.max_key_length:
+                self.max_key_length = len(key)
+            text = f"{key.lower()}\n{value.lower()}"
+            self._haystacks.append(text)
+            for gram in {text[start:start + GRAM_SIZE] for start in range(len(text) - GRAM_SIZE + 1)}:
+                posting = postings.get(gram)
+                if posting is None:
+                    posting = postings[gram] = array('I')
+                posting.append(entry_id)
+        self._all_ids = range(len(self.entries))
+        # Earlier results do not include the new entries, so the next search starts afresh
+        self._last_query = ""
+        self._last_ids = self._all_ids
+
+    def _candidates(self, query):
+        """Return the shortest posting list among the query's trigrams"""
+        if len(query) < GRAM_SIZE:
+            return self._all_ids
+        best = None
+        for start in range(len(query) - GRAM_SIZE + 1):
+            posting = self._postings.get(query[start:start + GRAM_SIZE])
+            if posting is None:
+                return ()
+            if best is None or len(posting) < len(best):
+                best = posting
+        return best
+
+    def search(self, query):
+        """Return the ascending ids of entries whose term or meaning contains query"""
+        query = query.strip().lower()
+        if not query:
+            ids = self._all_ids
+        else:
+            if self._last_query and self._last_query in query:
+                # The query only grew, so it can only narrow the previous results
+                candidates = self._last_ids
+            else:
+                candidates = self._candidates(query)
+            if "\n" in query:
+                # Only a query holding the separator could match across term and meaning
+                entries = self.entries
+                ids = [i for i in candidates if query in entries[i][0].lower() or query in entries[i][1].lower()]
+            else:
+                haystacks = self._haystacks
+                # "\n" separates term and meaning, so a match never spans both
+                ids = [i for i in candidates if query in haystacks[i]]
+        self._last_query = query
+        self._last_ids = ids
+        return ids
+
+    def format_entry(self, entry_id):
+        """Return the (padded term, meaning) pair displayed for an entry"""
+        key, value = self.entries[entry_id]
+        return f"{key:<{self.max_key_length}}", value
+
+
+def linear_search(dictionary, query):
+    """Reference implementation of the original full scan, used for benchmarking"""
+    query = query.strip().lower()
+    max_key_length = max(len(key) for key in dictionary.keys())
+    results = []
+    for key, value in dictionary.items():
+        if query in key.lower() or query in value.lower():
+            results.append((f"{key:<{max_key_length}}", value))
+    return results
@@ -0,0 +1,240 @@
+"""Classroom server: hosts many quiz sessions from one copy of the term data
+
+Run from the Source directory:
+    python server.py [--host 0.0.0.0] [--port 8765] [--history resource/server_history.db]
+
+Students' apps connect with `python main.py --server http://HOST:8765`.
+The API is JSON over HTTP/1.1 with keep-alive:
+    GET    /categories
+    POST   /sessions                {"category": ..., "test_type": ..., "multiple_choice": false, "reverse": false}
+    POST   /sessions/<id>/answer    {"answer": ...}
+    DELETE /sessions/<id>
+    GET    /history?test_type=&from=&to=
+"""
+import argparse
+import asyncio
+import json
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+from history_store import HistoryStore
+from quiz_engine import QuizEngine
+from resource_bundle import load_bundle
+
+# Separate from the desktop app's resource/history.db, so the two never share a file
+SERVER_HISTORY_FILE = "resource/server_history.db"
+FLUSH_INTERVAL = 2.0
+FLUSH_BATCH_SIZE = 200
+SESSION_IDLE_TIMEOUT = 2 * 60 * 60
+HISTORY_LIMIT = 500
+MAX_BODY_SIZE = 64 * 1024
+STATUS_TEXT = {200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found",
+               405: "Method Not Allowed", 413: "Payload Too Large"}
+
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def question_payload(session):
+    if session.current is None:
+        return None
+    key, value = session.current
+    question = {'number': session.number, 'total': session.total, 'term': key}
+    if session.choices:
+        question['choices'] = session.choices
+    return question
+
+
+class QuizServer:
+    """Serves quiz sessions over HTTP and writes finished tests to history in batches
+
+    The term data is loaded once and shared read-only by every session. All
+    history writes go through a single worker thread that owns the SQLite
+    connection, so the event loop never blocks on disk.
+    """
+
+    def __init__(self, data, history_path=SERVER_HISTORY_FILE):
+        self.engine = QuizEngine(data)
+        self.history_path = history_path
+        self.sessions = {}
+        self.pending_records = []
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="history")
+        self.store = None
+        self.server = None
+        self._flush_task = None
+
+    async def start(self, host, port):
+        loop = asyncio.get_running_loop()
+        self.store = await loop.run_in_executor(self.executor, HistoryStore, self.history_path)
+        self.server = await asyncio.start_server(self.handle_connection, host, port)
+        self._flush_task = asyncio.create_task(self.flush_periodically())
+        return self.server
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+        await self.flush()
+        await asyncio.get_running_loop().run_in_executor(self.executor, self.store.close)
+        self.executor.shutdown()
+
+    async def flush(self):
+        if not self.pending_records:
+            return
+        records, self.pending_records = self.pending_records, []
+        await asyncio.get_running_loop().run_in_executor(self.executor, self.store.extend, records)
+
+    async def flush_periodically(self):
+        while True:
+            await asyncio.sleep(FLUSH_INTERVAL)
+            try:
+                await self.flush()
+            except Exception as e:
+                print(f"Error saving history: {e}")
+            cutoff = time.monotonic() - SESSION_IDLE_TIMEOUT
+            for session_id in [i for i, (session, used) in self.sessions.items() if used < cutoff]:
+                del self.sessions[session_id]
+
+    def queue_record(self, record):
+        self.pending_records.append(record)
+        if len(self.pending_records) >= FLUSH_BATCH_SIZE:
+            asyncio.create_task(self.flush())
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target, version = request_line.decode('latin-1').split()
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode('latin-1').partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get('content-length', 0))
+                if length > MAX_BODY_SIZE:
+                    status, payload = 413, {'error': "request body too large"}
+                    keep_alive = False
+                else:
+                    body = await reader.readexactly(length) if length else b""
+                    status, payload = await self.dispatch(method, target, body)
+                    keep_alive = headers.get('connection', '').lower() != 'close' and version == "HTTP/1.1"
+                data = json.dumps(payload).encode('utf-8')
+                writer.write(
+                    f"HTTP/1.1 {status} {STATUS_TEXT[status]}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin-1') + data
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def dispatch(self, method, target, body):
+        url = urlsplit(target)
+        parts = [part for part in url.path.split("/") if part]
+        try:
+            request = json.loads(body) if body else {}
+            if not isinstance(request, dict):
+                raise HttpError(400, "request body must be a JSON object")
+            if parts == ["categories"] and method == "GET":
+                return 200, {'categories': sorted(self.engine.data)}
+            if parts == ["sessions"] and method == "POST":
+                return 201, self.create_session(request)
+            if len(parts) == 3 and parts[0] == "sessions" and parts[2] == "answer" and method == "POST":
+                return 200, self.answer(parts[1], request)
+            if len(parts) == 2 and parts[0] == "sessions" and method == "DELETE":
+                self.sessions.pop(parts[1], None)
+                return 200, {}
+            if parts == ["history"] and method == "GET":
+                return 200, await self.history(parse_qs(url.query))
+            raise HttpError(404, f"no route for {method} {url.path}")
+        except HttpError as e:
+            return e.status, {'error': str(e)}
+        except (ValueError, TypeError, KeyError) as e:
+            return 400, {'error': f"bad request: {e}"}
+
+    def create_session(self, request):
+        category = request.get('category', "dictionary")
+        if category not in self.engine.data:
+            raise HttpError(404, f"unknown category {category!r}")
+        session = self.engine.start(category, request.get('test_type'),
+                                    multiple_choice=bool(request.get('multiple_choice')),
+                                    reverse=bool(request.get('reverse')))
+        session.next()
+        session_id = uuid.uuid4().hex
+        self.sessions[session_id] = (session, time.monotonic())
+        return {'session': session_id, 'total': session.total, 'reverse': session.reverse,
+                'question': question_payload(session)}
+
+    def answer(self, session_id, request):
+        if session_id not in self.sessions:
+            raise HttpError(404, "unknown or expired session")
+        session, used = self.sessions[session_id]
+        if session.current is None:
+            raise HttpError(400, "session is already finished")
+        correct, expected = session.answer(str(request['answer']))
+        session.next()
+        response = {'correct': correct, 'expected': expected, 'score': session.correct,
+                    'question': question_payload(session)}
+        if session.current is None:
+            record = session.record()
+            self.queue_record(record)
+            response['record'] = record
+            del self.sessions[session_id]
+        else:
+            self.sessions[session_id] = (session, time.monotonic())
+        return response
+
+    async def history(self, query):
+        await self.flush()
+        test_type = query.get('test_type', [None])[0]
+        date_from = query.get('from', [None])[0]
+        date_to = query.get('to', [None])[0]
+        loop = asyncio.get_running_loop()
+
+        def read():
+            positions = self.store.query(test_type, date_from, date_to)[:HISTORY_LIMIT]
+            return [self.store[position] for position in positions]
+
+        return {'records': await loop.run_in_executor(self.executor, read)}
+
+
+async def serve(host, port, history_path):
+    server = QuizServer(load_bundle(), history_path)
+    await server.start(host, port)
+    print(f"Serving quiz sessions on http://{host}:{port}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve quiz sessions to a classroom")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--history", default=SERVER_HISTORY_FILE, help="SQLite file for finished tests")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.history))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""User-supplied term packs in resource/packs
+
+A pack is either a flat JSON object {"term": "meaning", ...} or a UTF-8
+tab-separated file with one "term<TAB>meaning" per line. Packs are read as a
+stream, a chunk at a time, so a pack with tens of thousands of terms never
+has to be parsed in one go. Terms and meanings are interned, so text shared
+between packs and the built-in dictionary is stored once.
+"""
+import json
+import os
+import sys
+
+PACK_DIR = "resource/packs"
+PACK_EXTENSIONS = (".json", ".tsv")
+READ_SIZE = 64 * 1024
+CHUNK_SIZE = 1000
+
+
+def discover_packs(pack_dir=PACK_DIR, reserved=()):
+    """Return {category: path} for the pack files in pack_dir, sorted by name"""
+    try:
+        names = sorted(os.listdir(pack_dir))
+    except OSError:
+        return {}
+    packs = {}
+    for name in names:
+        stem, extension = os.path.splitext(name)
+        category = stem.lower()
+        if extension.lower() in PACK_EXTENSIONS and category not in reserved and category not in packs:
+            packs[category] = os.path.join(pack_dir, name)
+    return packs
+
+
+def pack_title(category):
+    return category.replace("_", " ").replace("-", " ").title()
+
+
+def iter_json_object(file, read_size=READ_SIZE):
+    """Yield the (key, value) pairs of a flat JSON object, reading read_size characters at a time"""
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    eof = False
+
+    def refill():
+        nonlocal buffer, pos, eof
+        more = file.read(read_size)
+        eof = not more
+        buffer = buffer[pos:] + more
+        pos = 0
+
+    def peek():
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos] in " \t\r\n":
+                pos += 1
+            if pos < len(buffer) or eof:
+                return buffer[pos:pos + 1]
+            refill()
+
+    def value():
+        nonlocal pos
+        peek()
+        while True:
+            try:
+                result, end = decoder.raw_decode(buffer, pos)
+                # A token that touches the end of the buffer may continue in the next read
+                if end < len(buffer) or eof:
+                    pos = end
+                    return result
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            refill()
+
+    def expect(char):
+        nonlocal pos
+        if peek() != char:
+            raise ValueError(f"expected {char!r} in term pack")
+        pos += 1
+
+    expect("{")
+    if peek() == "}":
+        return
+    while True:
+        key = value()
+        expect(":")
+        item = value()
+        if not isinstance(key, str) or not isinstance(item, str):
+            raise ValueError("term packs map terms to meaning strings")
+        yield key, item
+        if peek() == ",":
+            pos += 1
+            continue
+        expect("}")
+        return
+
+
+def iter_tsv(file):
+    for line in file:
+        term, separator, meaning = line.rstrip("\r\n").partition("\t")
+        if separator and term:
+            yield term, meaning
+
+
+def iter_pack(path):
+    """Yield a pack's (term, meaning) pairs as interned strings"""
+    with open(path, 'r', encoding='utf-8') as file:
+        entries = iter_json_object(file) if path.lower().endswith(".json") else iter_tsv(file)
+        for term, meaning in entries:
+            yield sys.intern(term), sys.intern(meaning)
+
+
+def iter_pack_chunks(path, size=CHUNK_SIZE):
+    """Yield a pack's entries as lists of at most size pairs"""
+    chunk = []
+    for entry in iter_pack(path):
+        chunk.append(entry)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def load_packs(pack_dir=PACK_DIR, reserved=()):
+    """Load every pack at once; for tools without an event loop"""
+    return {category: dict(iter_pack(path)) for category, path in discover_packs(pack_dir, reserved).items()}
@@ -0,0 +1,14 @@
+import json
+import os
+import sys
+
+import pytest
+
+SOURCE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SOURCE_DIR)
+
+
+@pytest.fixture(scope="session")
+def dictionary():
+    with open(os.path.join(SOURCE_DIR, "resource", "dictionary.json"), 'r', encoding='utf-8') as file:
+        return json.load(file)
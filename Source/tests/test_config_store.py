@@ -0,0 +1,68 @@
+import json
+import time
+
+from config_store import ConfigStore
+
+
+class CountingStore(ConfigStore):
+    def __init__(self, *args, **kwargs):
+        self.writes = []
+        super().__init__(*args, **kwargs)
+
+    def _write(self, data):
+        self.writes.append(json.loads(data))
+        super()._write(data)
+
+
+def read(path):
+    with open(path, 'r', encoding='utf-8') as file:
+        return json.load(file)
+
+
+def test_burst_of_saves_is_one_write(tmp_path):
+    store = CountingStore(str(tmp_path / "config.json"), delay=0.2)
+    for volume in range(20):
+        store.save({'volume': volume})
+    time.sleep(0.6)
+    assert store.writes == [{'volume': 19}]
+    store.close()
+
+
+def test_flush_returns_once_on_disk(tmp_path):
+    path = tmp_path / "config.json"
+    # A delay far longer than the test: only flush can get the settings written in time
+    store = CountingStore(str(path), delay=60)
+    store.save({'theme': "dark"})
+    started = time.monotonic()
+    assert store.flush(timeout=5)
+    assert time.monotonic() - started < 5
+    assert read(path) == {'theme': "dark"}
+    assert not (tmp_path / "config.json.tmp").exists()
+    store.close()
+
+
+def test_previous_versions_rotate(tmp_path):
+    path = tmp_path / "config.json"
+    store = ConfigStore(str(path), delay=0, backups=2)
+    for version in range(1, 5):
+        store.save({'version': version})
+        store.flush()
+    store.close()
+    assert read(path) == {'version': 4}
+    assert read(f"{path}.1") == {'version': 3}
+    assert read(f"{path}.2") == {'version': 2}
+    assert not (tmp_path / "config.json.3").exists()
+
+
+def test_load_falls_back_to_backup(tmp_path):
+    path = tmp_path / "config.json"
+    store = ConfigStore(str(path), delay=0)
+    store.save({'theme': "light"})
+    store.flush()
+    store.save({'theme': "dark"})
+    store.flush()
+    path.write_text('{"theme": "da', encoding='utf-8')
+    assert store.load() == {'theme': "light"}
+    path.unlink()
+    assert store.load() == {'theme': "light"}
+    store.close()
@@ -0,0 +1,22 @@
+import random
+
+from distractors import DistractorIndex
+
+FRENCH = {"vite": "fast", "plus vite": "faster", "moins vite": "less fast", "lent": "slow", "plus lent": "slower",
+          "doux": "soft, sweet", "doucement": "softly, gently", "retenu": "held back", "cédez": "hold back",
+          "sourdine": "mute", "en dehors": "prominent", "sans": "without"}
+
+
+def test_pack_options_come_from_the_pack(dictionary, tmp_path):
+    index = DistractorIndex({"dictionary": dictionary, "french": FRENCH}, path=str(tmp_path / "distractors.json"))
+    rng = random.Random(0)
+    for term, meaning in FRENCH.items():
+        options = index.choices(term, meaning, rng=rng, category="french")
+        assert len(options) == 4 and meaning in options
+        assert set(options) <= set(FRENCH.values())
+        assert not any(index.grader.grade(option, meaning) for option in options if option != meaning)
+
+
+def test_similar_pack_meanings_rank_first(dictionary, tmp_path):
+    index = DistractorIndex({"dictionary": dictionary, "french": FRENCH}, path=str(tmp_path / "distractors.json"))
+    assert index.similar_meanings("french", "held back")[0] == "hold back"
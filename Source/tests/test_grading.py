@@ -0,0 +1,32 @@
+from grading import AnswerGrader, alternatives
+
+
+def test_typos_are_accepted():
+    grader = AnswerGrader(["gradually getting quicker", "at a walking/medium speed", "very quick"])
+    assert grader.grade("gradualy getting quicker", "gradually getting quicker")
+    assert grader.grade("walkng speed", "at a walking/medium speed")
+    assert grader.grade("very quik", "very quick")
+
+
+def test_typo_budget_is_per_word():
+    grader = AnswerGrader()
+    assert not grader.grade("gradually getting quicker", "gradually getting quieter")
+    assert not grader.grade("very quick", "very quiet")
+    assert not grader.grade("play on the D string", "play on the G string")
+
+
+def test_other_known_meaning_is_not_a_typo():
+    assert AnswerGrader().grade("held back", "hold back")
+    grader = AnswerGrader(["held back", "hold back"])
+    assert not grader.grade("held back", "hold back")
+
+
+def test_no_meaning_is_accepted_for_another(dictionary):
+    meanings = sorted(set(dictionary.values()))
+    grader = AnswerGrader(meanings)
+    accepted = [(given, expected) for given in meanings for expected in meanings
+                if given != expected and grader.grade(given, expected)]
+    # Only a meaning that is itself one of the alternatives may pass, as "slow" does for "slow, stately"
+    wrong = [(given, expected) for given, expected in accepted
+             if not alternatives(given) & alternatives(expected)]
+    assert wrong == []
@@ -0,0 +1,26 @@
+from history_store import HistoryStore
+
+
+def record(test_type, correct, answers=()):
+    return {
+        'date': "2024-05-06 10:00",
+        'test_type': test_type,
+        'score': f"{correct}/2",
+        'percentage': f"{correct / 2 * 100:.1f}%",
+        'answers': [list(answer) for answer in answers]
+    }
+
+
+def test_answers_follow_their_test_across_writers(tmp_path):
+    path = str(tmp_path / "history.db")
+    first = HistoryStore(path)
+    second = HistoryStore(path)
+    first.append(record("Tempo", 1, [("lento", "slow", "slow")]))
+    second.append(record("Signs", 2, [("fermata", "pause", "pause")]))
+    assert [position for position, answers in first.iter_answers()] == [0, 1]
+    assert dict(first.iter_answers())[1] == [["fermata", "pause", "pause"]]
+    assert len(first) == len(second) == 2
+    assert first[1]['test_type'] == "Signs"
+    assert first.stats().tests == second.stats().tests == 2
+    first.close()
+    second.close()
@@ -0,0 +1,28 @@
+from reverse_index import ANSWER_SEPARATOR, ReverseIndex, term_aliases
+
+
+def test_aliases_and_typos_are_accepted(dictionary):
+    index = ReverseIndex(dictionary)
+    [(meaning, answer)] = index.questions({"accelerando (accel.)": dictionary["accelerando (accel.)"]})
+    assert index.grade("accel.", answer)
+    assert index.grade("acelerando", answer)
+
+
+def test_typo_budget_is_per_word(dictionary):
+    index = ReverseIndex(dictionary)
+    [(meaning, answer)] = index.questions({"sul G": dictionary["sul G"]})
+    assert index.grade("sul G", answer)
+    assert not index.grade("sul D", answer)
+
+
+def test_no_term_is_accepted_for_another_meaning(dictionary):
+    index = ReverseIndex(dictionary)
+    wrong = []
+    for term in dictionary:
+        for answer, (forms, patterns) in index.entries.items():
+            # A term whose own alias is one of the answer's is a right answer, not a typo
+            if term in answer.split(ANSWER_SEPARATOR) or term_aliases(term) & forms:
+                continue
+            if index.grade(term, answer):
+                wrong.append((term, answer))
+    assert wrong == []
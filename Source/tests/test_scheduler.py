@@ -0,0 +1,24 @@
+from scheduler import ReviewScheduler
+
+
+def test_weakest_due_term_comes_first():
+    scheduler = ReviewScheduler({"lento": "slow", "presto": "very quick", "forte": "loud"}, {})
+    scheduler.record("presto", "very quick", True, now=0)
+    scheduler.record("forte", "loud", False, now=0)
+    # Both lento, never asked, and forte, missed a minute ago, are due; forte is weaker
+    assert scheduler.pop(now=1000) == "forte"
+
+
+def test_terms_outside_the_set_are_ignored():
+    saved = []
+
+    class Store:
+        def save(self, term, stats):
+            saved.append(term)
+
+    scheduler = ReviewScheduler({"lento": "slow"}, {}, store=Store())
+    scheduler.record("vite", "fast", True, now=0)
+    assert "vite" not in scheduler.meanings
+    assert "vite" not in scheduler.stats
+    assert saved == []
+    assert scheduler.pop(now=1) == "lento"
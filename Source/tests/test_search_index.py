@@ -0,0 +1,42 @@
+from search_index import SearchIndex, linear_search
+
+FIRST = {"allegro": "quick, lively", "allegretto": "fairly quick", "adagio": "slow, leisurely",
+         "lento": "slow", "a tempo": "return to the original speed", "tempo primo": "the first speed"}
+MORE = {"lentement": "slowly", "alla breve": "two minims in a bar", "più allegro": "quicker",
+        "Tempo di marcia": "march time"}
+
+
+def matches(index, query):
+    return [index.format_entry(entry_id) for entry_id in index.search(query)]
+
+
+def check(index, dictionary, queries):
+    for query in queries:
+        assert matches(index, query) == linear_search(dictionary, query), query
+
+
+QUERIES = [
+    # Growing, so each search narrows the last
+    "a", "al", "all", "alle", "allegr", "allegro",
+    # Shrinking
+    "allegr", "al", "", "l",
+    # Neither prefix nor extension of the previous query
+    "tempo", "empo", "mpo p", "SLOW", " slow ", "quick", "uick,", "speed", "xyz", "xyzz", "o\nq",
+]
+
+
+def test_search_matches_linear_scan():
+    index = SearchIndex(FIRST)
+    check(index, FIRST, QUERIES)
+
+
+def test_search_after_add_matches_linear_scan():
+    index = SearchIndex(FIRST)
+    # Leave a narrowed result behind, which add() must not keep using
+    check(index, FIRST, ["len", "lent"])
+    index.add(MORE.items())
+    combined = {**FIRST, **MORE}
+    check(index, combined, ["lente", "lent"] + QUERIES)
+    index.add({"allegrissimo": "very quick"}.items())
+    combined["allegrissimo"] = "very quick"
+    check(index, combined, ["allegro", "allegr", "allegri", "very", "very q"])
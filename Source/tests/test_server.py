@@ -0,0 +1,21 @@
+import asyncio
+
+import pytest
+
+from server import QuizServer
+
+
+@pytest.mark.parametrize("body", [b"[]", b'"x"', b"3"])
+def test_non_object_bodies_are_bad_requests(dictionary, body):
+    server = QuizServer({"dictionary": dictionary})
+    status, payload = asyncio.run(server.dispatch("POST", "/sessions", body))
+    assert status == 400
+    assert server.sessions == {}
+
+
+def test_sessions_start_and_end(dictionary):
+    server = QuizServer({"dictionary": dictionary})
+    status, payload = asyncio.run(server.dispatch("POST", "/sessions", b'{"category": "dictionary"}'))
+    assert status == 201 and payload['session'] in server.sessions
+    asyncio.run(server.dispatch("DELETE", f"/sessions/{payload['session']}", b""))
+    assert server.sessions == {}
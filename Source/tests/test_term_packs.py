@@ -0,0 +1,47 @@
+import io
+import json
+
+import pytest
+
+from term_packs import iter_json_object, iter_pack
+
+PACK = ('{ "cédez" : "hold back, \\"yield\\"",\n'
+        '  "Straße\\u00df": "path \\\\ way",\n'
+        '\t"très vite":"very fast — ça va", "": "", "sehr \\"lebhaft\\"": "very lively" }\n')
+
+
+@pytest.mark.parametrize("read_size", [1, 2, 3, 5, 7, 64])
+def test_pairs_survive_any_refill_boundary(read_size):
+    pairs = list(iter_json_object(io.StringIO(PACK), read_size=read_size))
+    assert pairs == list(json.loads(PACK).items())
+
+
+@pytest.mark.parametrize("read_size", [1, 2, 3])
+def test_utf8_file_read_in_small_pieces(tmp_path, read_size):
+    path = tmp_path / "french.json"
+    path.write_text(PACK, encoding='utf-8')
+    with open(path, 'r', encoding='utf-8') as file:
+        assert dict(iter_json_object(file, read_size=read_size)) == json.loads(PACK)
+    assert dict(iter_pack(str(path))) == json.loads(PACK)
+
+
+def test_empty_object():
+    assert list(iter_json_object(io.StringIO(" { } "), read_size=1)) == []
+
+
+@pytest.mark.parametrize("text", [
+    "",
+    "[]",
+    '["a", "b"]',
+    '{"a": 1}',
+    '{"a": ["b"]}',
+    '{"a" "b"}',
+    '{"a": "b",}',
+    '{"a": "b" "c": "d"}',
+    '{"a": "b"',
+    '{"a": "unterminated',
+])
+def test_malformed_packs_raise_value_error(text):
+    for read_size in (1, 4, 64):
+        with pytest.raises(ValueError):
+            list(iter_json_object(io.StringIO(text), read_size=read_size))
@@ -0,0 +1,82 @@
+THEMES = {
+    'dark': {
+        'bg': 'black',
+        'button_bg': '#333333',
+        'button_fg': 'white',
+        'label_fg': 'white',
+        'entry_bg': 'darkgray',
+        'entry_fg': 'black',
+        'icon': "🌞"
+    },
+    'light': {
+        'bg': 'white',
+        'button_bg': 'lightgray',
+        'button_fg': 'black',
+        'label_fg': 'black',
+        'entry_bg': 'white',
+        'entry_fg': 'black',
+        'icon': "🌙"
+    }
+}
+# Widget option -> theme colour, for each kind of themed widget
+ROLES = {
+    'frame': {'bg': 'bg'},
+    'label': {'bg': 'bg', 'fg': 'label_fg'},
+    'feedback': {'bg': 'bg'},
+    'button': {'bg': 'button_bg', 'fg': 'button_fg'},
+    'entry': {'bg': 'entry_bg', 'fg': 'entry_fg', 'readonlybackground': 'entry_bg', 'insertbackground': 'entry_fg'},
+    'text': {'bg': 'bg', 'fg': 'label_fg', 'insertbackground': 'label_fg'},
+    'scale': {'bg': 'bg', 'fg': 'label_fg'},
+    'check': {'bg': 'bg', 'fg': 'label_fg', 'selectcolor': 'bg', 'activebackground': 'bg'}
+}
+
+
+class ThemeManager:
+    """Registry of themed widgets, so a theme change reaches every live widget
+
+    Widgets are registered once with a role from ROLES, or with a callable
+    taking (widget, theme) for composite widgets. Destroyed widgets are
+    dropped the next time a theme is applied.
+    """
+
+    def __init__(self, root, themes=THEMES, name='dark'):
+        self.root = root
+        self.themes = dict(themes)
+        self.name = name
+        self.widgets = {}
+
+    @property
+    def colors(self):
+        return self.themes[self.name]
+
+    def add_themes(self, custom_themes):
+        """Add user-defined themes; missing colours fall back to the dark theme"""
+        for name, colors in custom_themes.items():
+            self.themes[name] = {**THEMES['dark'], 'icon': "🎨", **colors}
+
+    def register(self, widget, role):
+        self.widgets[str(widget)] = (widget, role)
+        self._style(widget, role)
+        return widget
+
+    def _style(self, widget, role):
+        if callable(role):
+            role(widget, self.colors)
+        else:
+            colors = self.colors
+            widget.configure(**{option: colors[key] for option, key in ROLES[role].items()})
+
+    def apply(self, name):
+        if name not in self.themes:
+            name = 'dark'
+        self.name = name
+        self.root.configure(bg=self.colors['bg'])
+        for path, (widget, role) in list(self.widgets.items()):
+            if widget.winfo_exists():
+                self._style(widget, role)
+            else:
+                del self.widgets[path]
+
+    def next_name(self):
+        names = list(self.themes)
+        return names[(names.index(self.name) + 1) % len(names)]